@@ -14,27 +14,54 @@ Data: 2025-08-24
 """
 
 # Exports for clashroyalebuildabot
+import importlib
+
 from . import constants
-from .bot import Bot
-from .detectors import CardDetector
-from .detectors import Detector
-from .detectors import NumberDetector
-from .detectors import OnnxDetector
-from .detectors import ScreenDetector
-from .detectors import UnitDetector
-from .emulator import Emulator
 from .namespaces import Cards
 from .namespaces import Screens
 from .namespaces import State
 from .namespaces import Units
-from .visualizer import Visualizer
 
-# Sistemas core (sem importar enhanced_bot aqui)
-from .core.card_roles import CardRole, CardRoleDatabase, DeckAnalyzer
-from .core.game_state import GameStateAnalyzer, GameStateInfo
-from .core.combo_system import ComboManager, ComboType
-from .core.defense_system import DefenseManager, ThreatAnalyzer
-from .core.enhanced_action import EnhancedAction
+# Demais exports são carregados sob demanda (PEP 562), para que
+# "from clashroyalebuildabot import Cards" não carregue ONNX, emulador, etc.
+_LAZY_EXPORTS = {
+    "Bot": ".bot",
+    "CardDetector": ".detectors",
+    "Detector": ".detectors",
+    "NumberDetector": ".detectors",
+    "OnnxDetector": ".detectors",
+    "ScreenDetector": ".detectors",
+    "UnitDetector": ".detectors",
+    "Emulator": ".emulator",
+    "Visualizer": ".visualizer",
+    # Sistemas core (sem importar enhanced_bot aqui)
+    "CardRole": ".core.card_roles",
+    "CardRoleDatabase": ".core.card_roles",
+    "DeckAnalyzer": ".core.card_roles",
+    "GameStateAnalyzer": ".core.game_state",
+    "GameStateInfo": ".core.game_state",
+    "ComboManager": ".core.combo_system",
+    "ComboType": ".core.combo_system",
+    "DefenseManager": ".core.defense_system",
+    "ThreatAnalyzer": ".core.defense_system",
+    "EnhancedAction": ".core.enhanced_action",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Próximos acessos não passam por aqui
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
+
 
 __version__ = "2.0.0"
 __author__ = "Assistente IA"
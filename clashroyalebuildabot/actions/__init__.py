@@ -1,53 +1,52 @@
 """
 Módulo de ações do bot.
 Contém implementações de cartas específicas.
+
+As classes são carregadas sob demanda (PEP 562): importar o pacote não
+importa os módulos de todas as cartas, apenas os usados pelo deck.
 """
 
-# Ações originais
-from .archers_action import ArchersAction
-from .arrows_action import ArrowsAction
-from .baby_dragon_action import BabyDragonAction
-from .bats_action import BatsAction
-from .cannon_action import CannonAction
-from .fireball_action import FireballAction
-from .giant_action import GiantAction
-from .goblin_barrel_action import GoblinBarrelAction
-from .knight_action import KnightAction
-from .minions_action import MinionsAction
-from .minipekka_action import MinipekkaAction
-from .musketeer_action import MusketeerAction
-from .skeletons_action import SkeletonsAction
-from .spear_goblins_action import SpearGoblinsAction
-from .witch_action import WitchAction
-from .zap_action import ZapAction
-
-# Ações aprimoradas
-from .enhanced_giant_action import EnhancedGiantAction
-from .enhanced_musketeer_action import EnhancedMusketeerAction
-from .enhanced_hog_rider_action import EnhancedHogRiderAction
-
-__all__ = [
+import importlib
+
+# Registro nome da classe -> módulo que a define
+_ACTION_MAP = {
     # Ações originais
-    "ArchersAction",
-    "ArrowsAction",
-    "BabyDragonAction",
-    "BatsAction",
-    "CannonAction",
-    "FireballAction",
-    "GiantAction",
-    "GoblinBarrelAction",
-    "KnightAction",
-    "MinionsAction",
-    "MinipekkaAction",
-    "MusketeerAction",
-    "SkeletonsAction",
-    "SpearGoblinsAction",
-    "WitchAction",
-    "ZapAction",
-    
+    "ArchersAction": ".archers_action",
+    "ArrowsAction": ".arrows_action",
+    "BabyDragonAction": ".baby_dragon_action",
+    "BatsAction": ".bats_action",
+    "CannonAction": ".cannon_action",
+    "FireballAction": ".fireball_action",
+    "GiantAction": ".giant_action",
+    "GoblinBarrelAction": ".goblin_barrel_action",
+    "KnightAction": ".knight_action",
+    "MinionsAction": ".minions_action",
+    "MinipekkaAction": ".minipekka_action",
+    "MusketeerAction": ".musketeer_action",
+    "SkeletonsAction": ".skeletons_action",
+    "SpearGoblinsAction": ".spear_goblins_action",
+    "WitchAction": ".witch_action",
+    "ZapAction": ".zap_action",
     # Ações aprimoradas
-    'EnhancedGiantAction',
-    'EnhancedMusketeerAction', 
-    'EnhancedHogRiderAction'
-]
+    "EnhancedGiantAction": ".enhanced_giant_action",
+    "EnhancedMusketeerAction": ".enhanced_musketeer_action",
+    "EnhancedHogRiderAction": ".enhanced_hog_rider_action",
+}
+
+__all__ = list(_ACTION_MAP)
+
+
+def __getattr__(name):
+    module_name = _ACTION_MAP.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    module = importlib.import_module(module_name, __name__)
+    action_class = getattr(module, name)
+    globals()[name] = action_class  # Próximos acessos não passam por aqui
+    return action_class
+
 
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,9 +1,6 @@
 from clashroyalebuildabot import Cards
-from clashroyalebuildabot.actions.generic.action import Action
+from clashroyalebuildabot.actions.generic.stub_action import StubAction
 
-class Archer_QueenAction(Action):
+
+class Archer_QueenAction(StubAction):
     CARD = Cards.ARCHER_QUEEN
-    
-    def calculate_score(self, state):
-        # Lógica básica - pode ser melhorada depois
-        return [0.5] if state.numbers.elixir.number >= self.CARD.cost else [0]
@@ -1,9 +1,6 @@
 from clashroyalebuildabot import Cards
-from clashroyalebuildabot.actions.generic.action import Action
+from clashroyalebuildabot.actions.generic.stub_action import StubAction
 
-class BanditAction(Action):
+
+class BanditAction(StubAction):
     CARD = Cards.BANDIT
-    
-    def calculate_score(self, state):
-        # Lógica básica - pode ser melhorada depois
-        return [0.5] if state.numbers.elixir.number >= self.CARD.cost else [0]
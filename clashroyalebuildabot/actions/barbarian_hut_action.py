@@ -1,9 +1,6 @@
 from clashroyalebuildabot import Cards
-from clashroyalebuildabot.actions.generic.action import Action
+from clashroyalebuildabot.actions.generic.stub_action import StubAction
 
-class Barbarian_HutAction(Action):
+
+class Barbarian_HutAction(StubAction):
     CARD = Cards.BARBARIAN_HUT
-    
-    def calculate_score(self, state):
-        # Lógica básica - pode ser melhorada depois
-        return [0.5] if state.numbers.elixir.number >= self.CARD.cost else [0]
@@ -4,25 +4,32 @@ O Gigante atua como tanque principal e iniciador de combos.
 """
 
 from clashroyalebuildabot import Cards
+from ..core._kernels import giant_basic_score
 from ..core.enhanced_action import EnhancedAction
 from ..core.card_roles import CardRole
+from ..core.game_state import CALM_MODES
+from ..core.game_state import DEFENSE_MODES
 from ..core.game_state import GameStateInfo
+from ..core.game_state import MID_LATE_PHASES
+
+
+# Escala do score estratégico, acumulado em inteiros (milésimos)
+_SCORE_SCALE = 1000
 
 
 class EnhancedGiantAction(EnhancedAction):
     """Ação aprimorada do Gigante com inteligência contextual"""
     
     CARD = Cards.GIANT
+    __slots__ = ()
     
     def calculate_score(self, state):
         """Cálculo de score aprimorado para o Gigante"""
         
         # Score base: só jogar se temos elixir suficiente
-        if state.numbers.elixir.number < 5:
+        if state.numbers.elixir.number < self.CARD.cost:
             return [0.0]
         
-        base_score = 0.3  # Score base moderado
-        
         # Usar sistema aprimorado se disponível
         if self.game_state_analyzer:
             return self._calculate_intelligent_score(state)
@@ -30,6 +37,12 @@ class EnhancedGiantAction(EnhancedAction):
         # Fallback para lógica original melhorada
         return self._calculate_improved_basic_score(state)
     
+    @classmethod
+    def _build_specialized(cls, deck_strategy):
+        terms = super()._build_specialized(deck_strategy)
+        terms["waits_for_combo"] = deck_strategy in ('HEAVY_TANK', 'BALANCED')
+        return terms
+    
     def _calculate_intelligent_score(self, state):
         """Cálculo inteligente usando análise de contexto"""
         
@@ -37,7 +50,7 @@ class EnhancedGiantAction(EnhancedAction):
         
         # Não jogar Gigante se há ameaça crítica que precisa de defesa
         if game_state.should_defend:
-            primary_threat = game_state.get_primary_threat()
+            primary_threat = game_state.primary_threat
             if primary_threat and primary_threat.requires_immediate_response:
                 return [0.1]  # Score muito baixo, mas não zero
         
@@ -61,35 +74,29 @@ class EnhancedGiantAction(EnhancedAction):
     def _get_strategic_score(self, game_state: GameStateInfo, state) -> float:
         """Score baseado na estratégia do deck e situação atual"""
         
-        base_score = 0.4
+        base_score = 400
         
         # Gigante é melhor quando temos vantagem de elixir
         if game_state.enemy_elixir_deficit >= 3:
-            base_score += 0.4
+            base_score += 400
         elif game_state.enemy_elixir_deficit >= 1:
-            base_score += 0.2
+            base_score += 200
         
         # Gigante é melhor quando não há defesas pesadas inimigas
-        heavy_defenses = ['inferno_tower', 'pekka', 'mini_pekka']
-        enemy_has_heavy_defense = any(
-            any(defense in threat.card_name.lower() for defense in heavy_defenses)
-            for threat in game_state.threats
-        )
-        
-        if not enemy_has_heavy_defense:
-            base_score += 0.3
+        if game_state.enemy_heavy_defense_mask:
+            base_score -= 200
         else:
-            base_score -= 0.2
+            base_score += 300
         
         # Melhor em fases mid/late do jogo
-        if game_state.phase.value in ['mid', 'late']:
-            base_score += 0.2
+        if game_state.phase & MID_LATE_PHASES:
+            base_score += 200
         
         # Forçar jogada se elixir está cheio
         if state.numbers.elixir.number >= 9:
-            base_score += 0.3
+            base_score += 300
         
-        return min(1.0, base_score)
+        return min(1.0, base_score / _SCORE_SCALE)
     
     def _get_combo_score(self, game_state: GameStateInfo, state) -> float:
         """Score baseado em oportunidades de combo"""
@@ -98,7 +105,7 @@ class EnhancedGiantAction(EnhancedAction):
             return 1.0
         
         # Verificar se há combo ativo que precisa do Gigante
-        combo_boost = self.combo_manager.get_combo_priority_boost(self.CARD)
+        combo_boost = self._get_combo_boost(game_state)
         if combo_boost > 1.0:
             return combo_boost
         
@@ -124,11 +131,11 @@ class EnhancedGiantAction(EnhancedAction):
             return 1.1
         
         # Timing neutro
-        if game_state.game_mode in ['NEUTRAL', 'ATTACK']:
+        if game_state.game_mode & CALM_MODES:
             return 1.0
         
         # Timing ruim se estamos defendendo
-        if game_state.game_mode in ['EMERGENCY_DEFENSE', 'ACTIVE_DEFENSE']:
+        if game_state.game_mode & DEFENSE_MODES:
             return 0.6
         
         return 1.0
@@ -137,8 +144,8 @@ class EnhancedGiantAction(EnhancedAction):
         """Determina prioridade de posicionamento"""
         
         # Priorizar lado com menos defesas inimigas
-        left_threats = sum(1 for t in game_state.threats if t.position[0] <= 9)
-        right_threats = sum(1 for t in game_state.threats if t.position[0] > 9)
+        left_threats = game_state.left_threat_count
+        right_threats = game_state.right_threat_count
         
         if left_threats < right_threats:
             return -1.0  # Preferir lado esquerdo
@@ -150,32 +157,14 @@ class EnhancedGiantAction(EnhancedAction):
     def _calculate_improved_basic_score(self, state):
         """Versão melhorada da lógica básica original"""
         
-        # Lógica original melhorada
-        base_score = 0.5 if state.numbers.elixir.number >= 8 else 0.2
-        
-        # Melhorar score baseado em inimigos
-        for enemy in state.enemies:
-            # Se inimigo está longe, é boa oportunidade para Gigante
-            distance = ((enemy.position.tile_x - 9) ** 2 + (enemy.position.tile_y - 14) ** 2) ** 0.5
-            
-            if distance >= 8:  # Inimigo longe das torres
-                base_score += 0.3
-            elif distance <= 4:  # Inimigo perto, não é bom momento
-                base_score -= 0.2
-        
-        # Posicionamento inteligente
-        position_score = 0.0
-        
-        # Verificar qual lado tem menos inimigos
-        left_enemies = sum(1 for e in state.enemies if e.position.tile_x <= 9)
-        right_enemies = sum(1 for e in state.enemies if e.position.tile_x > 9)
-        
-        if left_enemies < right_enemies:
-            position_score = -1.0  # Preferir esquerda
-        elif right_enemies < left_enemies:
-            position_score = 1.0   # Preferir direita
-        
-        return [max(0.0, base_score), position_score]
+        # Kernel numérico (compilado com numba quando disponível)
+        snapshot = state.get_snapshot()
+        base_score, position_score = giant_basic_score(
+            snapshot.enemy_tile_x,
+            snapshot.enemy_tile_y,
+            state.numbers.elixir.number,
+        )
+        return [base_score, position_score]
     
     def get_optimal_position(self, game_state: GameStateInfo, state):
         """Posicionamento ótimo do Gigante"""
@@ -189,8 +178,8 @@ class EnhancedGiantAction(EnhancedAction):
         # Posicionamento estratégico baseado no contexto
         if game_state:
             # Atacar lado com menos defesas
-            left_threats = sum(1 for t in game_state.threats if t.position[0] <= 9)
-            right_threats = sum(1 for t in game_state.threats if t.position[0] > 9)
+            left_threats = game_state.left_threat_count
+            right_threats = game_state.right_threat_count
             
             if left_threats < right_threats:
                 return (7, 4)   # Atrás da torre do rei, lado esquerdo
@@ -214,7 +203,7 @@ class EnhancedGiantAction(EnhancedAction):
         
         # Se há ameaça crítica, não esperar
         if game_state.should_defend:
-            primary_threat = game_state.get_primary_threat()
+            primary_threat = game_state.primary_threat
             if primary_threat and primary_threat.requires_immediate_response:
                 return False
         
@@ -223,7 +212,7 @@ class EnhancedGiantAction(EnhancedAction):
         support_cards = self.deck_analyzer.get_support_cards()
         
         # Se estratégia do deck favorece combos, esperar um pouco
-        if self.deck_analyzer.strategy in ['HEAVY_TANK', 'BALANCED']:
+        if self._strategy_terms()["waits_for_combo"]:
             return state.numbers.elixir.number < 8
         
         return False
@@ -3,22 +3,47 @@ Lógica aprimorada do Corredor (Hog Rider) com comportamento inteligente.
 O Corredor é especialista em contra-ataques rápidos e pressão constante.
 """
 
+import numpy as np
+
 from clashroyalebuildabot import Cards
+from ..core._kernels import hog_basic_score
 from ..core.enhanced_action import EnhancedAction
 from ..core.card_roles import CardRole
+from ..core.counters import DEFENSIVE_BUILDINGS_LUT
+from ..core.counters import HOG_HARD_COUNTERS_LUT
+from ..core.counters import HOG_SOFT_COUNTERS_LUT
+from ..core.counters import HOG_WAIT_COUNTERS_LUT
+from ..core.game_state import GameMode
+from ..core.game_state import GamePhase
 from ..core.game_state import GameStateInfo, ThreatLevel
 
 
+# Score final abaixo do qual a jogada é descartada sem mais cálculos
+_MIN_VIABLE_SCORE = 0.01
+
+# Maior valor possível de _get_pressure_score (1.0 + 0.2 + 0.3 + 0.2), que
+# multiplica o score depois das saídas antecipadas
+_MAX_PRESSURE_SCORE = 1.7
+
+# Limite das saídas antecipadas: abaixo dele, nem a pressão máxima leva o
+# score final a _MIN_VIABLE_SCORE
+_MIN_PARTIAL_SCORE = _MIN_VIABLE_SCORE / _MAX_PRESSURE_SCORE
+
+# Escala do score de contra-ataque, acumulado em inteiros (milésimos)
+_SCORE_SCALE = 1000
+
+
 class EnhancedHogRiderAction(EnhancedAction):
     """Ação aprimorada do Corredor com inteligência contextual"""
     
     CARD = Cards.HOG_RIDER
+    __slots__ = ()
     
     def calculate_score(self, state):
         """Cálculo de score aprimorado para o Corredor"""
         
         # Score base: Corredor precisa de timing certo
-        if state.numbers.elixir.number < 4:
+        if state.numbers.elixir.number < self.CARD.cost:
             return [0.0]
         
         # Usar sistema aprimorado se disponível
@@ -28,25 +53,40 @@ class EnhancedHogRiderAction(EnhancedAction):
         # Fallback para lógica melhorada
         return self._calculate_improved_basic_score(state)
     
+    @classmethod
+    def _build_specialized(cls, deck_strategy):
+        terms = super()._build_specialized(deck_strategy)
+        is_cycle = deck_strategy == "CYCLE"
+        terms["pressure_bonus"] = 0.3 if is_cycle else 0.0
+        terms["synergy_bonus"] = 0.2 if is_cycle else 0.0
+        return terms
+    
     def _calculate_intelligent_score(self, state):
         """Cálculo inteligente usando análise de contexto"""
         
         game_state = self.game_state_analyzer.analyze_state(state)
         
+        # Fatores que mais zeram o score vêm primeiro, permitindo sair cedo
+        # Score baseado na ausência de contadores inimigos
+        counter_avoidance_score = self._get_counter_avoidance_score(game_state, state)
+        
+        # Score baseado no timing (Corredor é muito dependente de timing)
+        timing_score = self._get_timing_score(game_state, state)
+        partial_score = counter_avoidance_score * timing_score
+        if partial_score < _MIN_PARTIAL_SCORE:
+            return [0.0]  # Mesmo formato da jogada recusada por elixir
+        
         # Corredor é principalmente para contra-ataque
         counter_attack_score = self._get_counter_attack_score(game_state, state)
+        if partial_score * counter_attack_score < _MIN_PARTIAL_SCORE:
+            return [0.0]
         
         # Score baseado na pressão que pode exercer
         pressure_score = self._get_pressure_score(game_state, state)
         
-        # Score baseado na ausência de contadores inimigos
-        counter_avoidance_score = self._get_counter_avoidance_score(game_state, state)
-        
-        # Score baseado no timing
-        timing_score = self._get_timing_score(game_state, state)
-        
-        # Combinar scores (Corredor é muito dependente de timing)
-        final_score = counter_attack_score * counter_avoidance_score * timing_score * pressure_score
+        # Combinar scores
+        final_score = (counter_avoidance_score * timing_score
+                       * counter_attack_score * pressure_score)
         
         # Informação de posicionamento (Corredor sempre vai para a ponte)
         position_info = self._get_lane_priority(game_state, state)
@@ -56,31 +96,31 @@ class EnhancedHogRiderAction(EnhancedAction):
     def _get_counter_attack_score(self, game_state: GameStateInfo, state) -> float:
         """Score baseado em oportunidades de contra-ataque"""
         
-        base_score = 0.3
+        base_score = 300
         
         # SITUAÇÃO IDEAL: Inimigo gastou muito elixir
         if game_state.enemy_elixir_deficit >= 5:
-            base_score += 0.6  # Score muito alto
+            base_score += 600  # Score muito alto
         elif game_state.enemy_elixir_deficit >= 3:
-            base_score += 0.4  # Score alto
+            base_score += 400  # Score alto
         elif game_state.enemy_elixir_deficit >= 1:
-            base_score += 0.2  # Score moderado
+            base_score += 200  # Score moderado
         else:
-            base_score -= 0.1  # Penalizar se inimigo tem elixir
+            base_score -= 100  # Penalizar se inimigo tem elixir
         
         # BOOST APÓS DEFESA BEM-SUCEDIDA
         # Se acabamos de defender e inimigo gastou elixir
         if (len(game_state.threats) == 0 and 
             game_state.enemy_elixir_deficit >= 3):
-            base_score += 0.4
+            base_score += 400
         
         # PENALIZAR SE ESTAMOS DEFENDENDO
         if game_state.should_defend:
-            primary_threat = game_state.get_primary_threat()
+            primary_threat = game_state.primary_threat
             if primary_threat and primary_threat.requires_immediate_response:
-                base_score *= 0.3  # Reduzir drasticamente
+                base_score = base_score * 3 // 10  # Reduzir drasticamente (x0.3)
         
-        return min(1.0, base_score)
+        return min(1.0, base_score / _SCORE_SCALE)
     
     def _get_pressure_score(self, game_state: GameStateInfo, state) -> float:
         """Score baseado na pressão que pode exercer"""
@@ -93,14 +133,12 @@ class EnhancedHogRiderAction(EnhancedAction):
             base_score += 0.2
         
         # Estratégia de cycle favorece Corredor
-        if (self.deck_analyzer and 
-            self.deck_analyzer.strategy == "CYCLE"):
-            base_score += 0.3
+        base_score += self._strategy_terms()["pressure_bonus"]
         
         # Fase do jogo
-        if game_state.phase.value == 'early':
+        if game_state.phase is GamePhase.EARLY:
             base_score += 0.1  # Boa pressão inicial
-        elif game_state.phase.value == 'late':
+        elif game_state.phase is GamePhase.LATE:
             base_score += 0.2  # Pressão final importante
         
         return base_score
@@ -108,31 +146,22 @@ class EnhancedHogRiderAction(EnhancedAction):
     def _get_counter_avoidance_score(self, game_state: GameStateInfo, state) -> float:
         """Score baseado na ausência de contadores inimigos"""
         
-        # Contadores principais do Corredor
-        hard_counters = ['cannon', 'tesla', 'tombstone', 'skeleton_army', 'barbarians']
-        soft_counters = ['knight', 'valkyrie', 'mini_pekka', 'guards']
+        batch = game_state.threat_batch
         
-        base_score = 1.0
+        # Contadores duros = penalidade alta (maior perto da torre)
+        hard_mask = HOG_HARD_COUNTERS_LUT[batch.card_ids]
+        hard_near = np.count_nonzero(hard_mask & (batch.distances <= 8))
+        hard_far = np.count_nonzero(hard_mask) - hard_near
         
-        # Verificar se há contadores no campo
-        for threat in game_state.threats:
-            threat_name = threat.card_name.lower()
-            
-            # Contadores duros = penalidade alta
-            if any(counter in threat_name for counter in hard_counters):
-                if threat.distance_to_tower <= 8:  # Perto da torre
-                    base_score *= 0.3
-                else:
-                    base_score *= 0.6
-            
-            # Contadores suaves = penalidade moderada
-            elif any(counter in threat_name for counter in soft_counters):
-                if threat.distance_to_tower <= 6:
-                    base_score *= 0.7
-                else:
-                    base_score *= 0.9
+        # Contadores suaves = penalidade moderada
+        soft_mask = HOG_SOFT_COUNTERS_LUT[batch.card_ids] & ~hard_mask
+        soft_near = np.count_nonzero(soft_mask & (batch.distances <= 6))
+        soft_far = np.count_nonzero(soft_mask) - soft_near
         
-        return base_score
+        return float(
+            0.3 ** hard_near * 0.6 ** hard_far
+            * 0.7 ** soft_near * 0.9 ** soft_far
+        )
     
     def _get_timing_score(self, game_state: GameStateInfo, state) -> float:
         """Score baseado no timing da jogada"""
@@ -148,7 +177,7 @@ class EnhancedHogRiderAction(EnhancedAction):
             base_score += 0.2
         
         # TIMING RUIM: Durante defesa crítica
-        if game_state.game_mode == "EMERGENCY_DEFENSE":
+        if game_state.game_mode is GameMode.EMERGENCY_DEFENSE:
             base_score *= 0.2
         
         # TIMING FORÇADO: Elixir cheio
@@ -157,7 +186,7 @@ class EnhancedHogRiderAction(EnhancedAction):
         
         # COMBO TIMING: Se faz parte de combo
         if self.combo_manager:
-            combo_boost = self.combo_manager.get_combo_priority_boost(self.CARD)
+            combo_boost = self._get_combo_boost(game_state)
             if combo_boost > 1.0:
                 base_score *= combo_boost
         
@@ -167,18 +196,8 @@ class EnhancedHogRiderAction(EnhancedAction):
         """Determina qual lane atacar"""
         
         # Analisar defesas em cada lane
-        left_defenses = 0
-        right_defenses = 0
-        
-        for threat in game_state.threats:
-            if threat.position[0] <= 9:  # Lado esquerdo
-                if any(defense in threat.card_name.lower() 
-                      for defense in ['cannon', 'tesla', 'tombstone']):
-                    left_defenses += 1
-            else:  # Lado direito
-                if any(defense in threat.card_name.lower() 
-                      for defense in ['cannon', 'tesla', 'tombstone']):
-                    right_defenses += 1
+        left_defenses = game_state.left_defense_count
+        right_defenses = game_state.right_defense_count
         
         # Atacar lado com menos defesas
         if left_defenses < right_defenses:
@@ -199,38 +218,12 @@ class EnhancedHogRiderAction(EnhancedAction):
     def _calculate_improved_basic_score(self, state):
         """Versão melhorada da lógica básica"""
         
-        base_score = 0.3
-        
-        # Boost baseado em elixir disponível
-        if state.numbers.elixir.number >= 6:
-            base_score += 0.3
-        elif state.numbers.elixir.number >= 8:
-            base_score += 0.5
-        
-        # Analisar inimigos no campo
-        building_enemies = 0
-        troop_enemies = 0
-        
-        for enemy in state.enemies:
-            # Simplificado: assumir que inimigos em posições defensivas são construções
-            if enemy.position.tile_y >= 12:  # Perto das torres
-                building_enemies += 1
-            else:
-                troop_enemies += 1
-        
-        # Penalizar se há muitas defesas
-        if building_enemies >= 2:
-            base_score *= 0.5
-        elif building_enemies == 1:
-            base_score *= 0.7
-        
-        # Boost se há poucas tropas inimigas
-        if troop_enemies == 0:
-            base_score += 0.4
-        elif troop_enemies == 1:
-            base_score += 0.2
-        
-        return [max(0.0, min(1.0, base_score)), 0.0]
+        # Kernel numérico (compilado com numba quando disponível)
+        snapshot = state.get_snapshot()
+        base_score = hog_basic_score(
+            snapshot.enemy_tile_y, state.numbers.elixir.number
+        )
+        return [base_score, 0.0]
     
     def get_optimal_position(self, game_state: GameStateInfo, state):
         """Posicionamento ótimo do Corredor (sempre na ponte)"""
@@ -260,12 +253,12 @@ class EnhancedHogRiderAction(EnhancedAction):
         # Corredor raramente espera - é carta de timing
         
         # Só esperar se há contador direto no campo
-        hard_counters = ['cannon', 'tesla', 'tombstone', 'skeleton_army']
-        
-        for threat in game_state.threats:
-            if any(counter in threat.card_name.lower() for counter in hard_counters):
-                if threat.distance_to_tower <= 6:
-                    return True  # Esperar por feitiço ou suporte
+        batch = game_state.threat_batch
+        counters_near = (
+            HOG_WAIT_COUNTERS_LUT[batch.card_ids] & (batch.distances <= 6)
+        )
+        if counters_near.any():
+            return True  # Esperar por feitiço ou suporte
         
         # Não esperar se há oportunidade de contra-ataque
         if game_state.enemy_elixir_deficit >= 4:
@@ -286,9 +279,7 @@ class EnhancedHogRiderAction(EnhancedAction):
         # (implementação simplificada)
         
         # Sinergia com cartas de cycle
-        if (self.deck_analyzer and 
-            self.deck_analyzer.strategy == "CYCLE"):
-            base_synergy += 0.2
+        base_synergy += self._strategy_terms()["synergy_bonus"]
         
         # Melhor sinergia quando inimigo tem baixo elixir
         if game_state.enemy_elixir_deficit >= 3:
@@ -308,16 +299,17 @@ class EnhancedHogRiderAction(EnhancedAction):
             return False
         
         if game_state.should_defend:
-            primary_threat = game_state.get_primary_threat()
+            primary_threat = game_state.primary_threat
             if primary_threat and primary_threat.requires_immediate_response:
                 return False
         
         # Verificar contadores no campo
-        hard_counters = ['cannon', 'tesla', 'tombstone']
-        for threat in game_state.threats:
-            if any(counter in threat.card_name.lower() for counter in hard_counters):
-                if threat.distance_to_tower <= 8:
-                    return False
+        batch = game_state.threat_batch
+        counters_near = (
+            DEFENSIVE_BUILDINGS_LUT[batch.card_ids] & (batch.distances <= 8)
+        )
+        if counters_near.any():
+            return False
         
         return True
 
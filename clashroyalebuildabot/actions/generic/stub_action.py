@@ -0,0 +1,35 @@
+import numpy as np
+
+from clashroyalebuildabot.actions.generic.action import Action
+
+
+class StubAction(Action):
+    """
+    Ação básica para cartas ainda sem lógica própria:
+    joga a carta sempre que houver elixir suficiente.
+
+    Os custos de todas as subclasses ficam em STUB_COSTS, de modo que
+    batch_stub_scores calcula os scores de todas as cartas numa única
+    comparação vetorizada.
+    """
+
+    STUB_SCORE = 0.5
+    STUB_COSTS = np.zeros(0, dtype=np.int64)
+    _STUB_COST = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.CARD is None:
+            return
+        # Registrar o custo da carta no array compartilhado
+        cls._STUB_COST = int(cls.CARD.cost)
+        StubAction.STUB_COSTS = np.append(StubAction.STUB_COSTS, cls.CARD.cost)
+
+    @classmethod
+    def batch_stub_scores(cls, elixir):
+        """Calcula os scores de todas as cartas stub de uma só vez"""
+        return np.where(StubAction.STUB_COSTS <= elixir, cls.STUB_SCORE, 0.0)
+
+    def calculate_score(self, state):
+        elixir = state.numbers.elixir.number
+        return [self.STUB_SCORE] if self._STUB_COST <= elixir else [0]
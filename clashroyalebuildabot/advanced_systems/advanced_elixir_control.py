@@ -6,23 +6,80 @@ Sistema que monitora e controla precisamente o elixir próprio e do oponente,
 criando oportunidades táticas baseadas em vantagens/desvantagens de elixir.
 """
 
-from typing import Dict, List, Optional, Tuple, Callable
-from enum import Enum
+from typing import Deque, Dict, List, Optional, Tuple, Callable
+from enum import Enum, IntEnum
 from dataclasses import dataclass, field
 import time
 import math
+import heapq
 from collections import deque
 
+import numpy as np
+
+from clashroyalebuildabot.core._kernels import elixir_horizon_predictions
+from clashroyalebuildabot.core._kernels import warm_up_kernels
 from clashroyalebuildabot.namespaces.cards import Cards
 
 
-class ElixirState(Enum):
-    """Estados de elixir"""
-    CRITICAL = "critical"     # 0-2 elixir
-    LOW = "low"              # 3-4 elixir
-    MEDIUM = "medium"        # 5-6 elixir
-    HIGH = "high"            # 7-8 elixir
-    FULL = "full"            # 9-10 elixir
+# Janela (segundos) usada para a média de gastos do inimigo
+ENEMY_SPENDING_WINDOW = 30
+
+# Modificadores de valor de carta por contexto
+_CONTEXT_MULTIPLIERS: Dict[str, float] = {
+    "attack": 1.2,
+    "defense": 1.1,
+    "counter_attack": 1.5,
+    "emergency": 0.8,  # Menos eficiente sob pressão
+    "advantage": 1.3,  # Mais eficiente com vantagem
+    "disadvantage": 0.9
+}
+
+# Horizontes das predições de elixir (segundos à frente)
+PREDICTION_HORIZONS = (3, 6, 9, 12, 15)
+_HORIZONS = np.array(PREDICTION_HORIZONS, dtype=np.float64)
+_HORIZON_CONFIDENCE = np.maximum(0.3, 1.0 - _HORIZONS / 20.0).tolist()
+
+# Custo estimado de cada carta (as demais contam como 4)
+_CARD_COSTS: Dict[Cards, int] = {
+    # Cartas baratas (1-3)
+    Cards.SKELETONS: 1, Cards.ICE_SPIRIT: 1, Cards.HEAL_SPIRIT: 1,
+    Cards.BATS: 2, Cards.SPEAR_GOBLINS: 2, Cards.GOBLINS: 2, Cards.ZAP: 2,
+    Cards.SKELETON_ARMY: 3, Cards.ARCHERS: 3, Cards.KNIGHT: 3, Cards.ARROWS: 3,
+    Cards.CANNON: 3, Cards.TOMBSTONE: 3, Cards.BOMBER: 3,
+    
+    # Cartas médias (4-5)
+    Cards.MUSKETEER: 4, Cards.MINIPEKKA: 4, Cards.VALKYRIE: 4, Cards.HOG_RIDER: 4,
+    Cards.FIREBALL: 4, Cards.TESLA: 4, Cards.ICE_GOLEM: 2, Cards.POISON: 4,
+    Cards.GIANT: 5, Cards.WIZARD: 5, Cards.BALLOON: 5, Cards.INFERNO_TOWER: 5,
+    
+    # Cartas caras (6+)
+    Cards.LIGHTNING: 6, Cards.ROCKET: 6, Cards.PEKKA: 7, Cards.GOLEM: 8,
+    Cards.ELECTRO_GIANT: 8, Cards.LAVA_HOUND: 7, Cards.MEGA_KNIGHT: 7
+}
+
+
+class ElixirState(IntEnum):
+    """Estados de elixir (ordenados: permitem comparar com < e >=)"""
+    CRITICAL = 0     # 0-2 elixir
+    LOW = 1          # 3-4 elixir
+    MEDIUM = 2       # 5-6 elixir
+    HIGH = 3         # 7-8 elixir
+    FULL = 4         # 9-10 elixir
+    
+    @property
+    def label(self) -> str:
+        """Nome legível do estado ("critical", "low", ...)"""
+        return self.name.lower()
+
+
+# Estado de elixir indexado pelo valor (0-10) - evita a cadeia de if/elif
+_ELIXIR_STATE_LUT = (
+    (ElixirState.CRITICAL,) * 3
+    + (ElixirState.LOW,) * 2
+    + (ElixirState.MEDIUM,) * 2
+    + (ElixirState.HIGH,) * 2
+    + (ElixirState.FULL,) * 2
+)
 
 
 class ElixirStrategy(Enum):
@@ -44,9 +101,27 @@ class ElixirOpportunity(Enum):
     DEFENSIVE_SETUP = "defensive_setup"       # Configurar defesa
 
 
+# Oportunidade, confiança e duração por vantagem de elixir (-4 a +4)
+_OPPORTUNITY_TABLE: Tuple[Tuple[Optional[ElixirOpportunity], float, float], ...] = (
+    (ElixirOpportunity.DEFENSIVE_SETUP, 0.9, 10.0),  # Grande desvantagem
+    (ElixirOpportunity.CYCLE_PRESSURE, 0.7, 5.0),    # Desvantagem moderada
+    (ElixirOpportunity.CYCLE_PRESSURE, 0.7, 5.0),
+    (None, 0.5, 5.0),
+    (None, 0.5, 5.0),
+    (None, 0.5, 5.0),
+    (ElixirOpportunity.COUNTER_ATTACK, 0.8, 6.0),    # Vantagem moderada
+    (ElixirOpportunity.COUNTER_ATTACK, 0.8, 6.0),
+    (ElixirOpportunity.HEAVY_PUSH, 0.9, 8.0),        # Grande vantagem
+)
+
+
 @dataclass
 class ElixirAdvantage:
     """Vantagem de elixir em um momento específico"""
+    # __slots__ explícito: dataclass(slots=True) exige Python 3.10
+    __slots__ = ("timestamp", "our_elixir", "enemy_elixir", "advantage",
+                 "confidence", "duration_estimate", "opportunity")
+
     timestamp: float
     our_elixir: int
     enemy_elixir: int
@@ -59,6 +134,10 @@ class ElixirAdvantage:
 @dataclass
 class ElixirPrediction:
     """Predição de elixir futuro"""
+    __slots__ = ("time_offset", "predicted_our_elixir",
+                 "predicted_enemy_elixir", "predicted_advantage",
+                 "confidence", "recommended_action")
+
     time_offset: float  # Segundos no futuro
     predicted_our_elixir: int
     predicted_enemy_elixir: int
@@ -71,17 +150,23 @@ class AdvancedElixirController:
     """Controlador avançado de elixir"""
     
     def __init__(self):
+        warm_up_kernels()  # JIT fora do caminho das decisões
+        
         # Estado atual
         self.our_current_elixir: int = 5
-        self.enemy_current_elixir: int = 5
+        self.enemy_current_elixir: float = 5.0  # Estimativa fracionária
         self.last_update_time: float = time.time()
         
         # Histórico de elixir
         self.elixir_history: deque = deque(maxlen=100)  # (timestamp, our_elixir, enemy_elixir)
         self.spending_history: deque = deque(maxlen=50)  # (timestamp, amount, player)
         
+        # Gastos inimigos recentes com soma incremental (ver _expire_enemy_window)
+        self._enemy_spend_window: deque = deque()  # (timestamp, amount)
+        self._enemy_recent_sum: int = 0
+        
         # Rastreamento de regeneração
-        self.elixir_generation_rate: float = 1.0  # 1 elixir por segundo
+        self.elixir_generation_rate: float = 1.0  # 1 elixir por segundo (2 no double elixir)
         self.double_elixir_active: bool = False
         self.double_elixir_start_time: Optional[float] = None
         
@@ -90,12 +175,12 @@ class AdvancedElixirController:
         self.our_spending_efficiency: Dict[str, float] = {}     # ação -> eficiência
         
         # Predições e oportunidades
-        self.current_advantages: List[ElixirAdvantage] = []
+        self.current_advantages: Deque[ElixirAdvantage] = deque()  # ordem de inserção
         self.predicted_states: List[ElixirPrediction] = []
         
         # Estratégias adaptativas
         self.current_strategy: ElixirStrategy = ElixirStrategy.CONSERVATIVE
-        self.strategy_success_rates: Dict[ElixirStrategy, List[bool]] = {}
+        self.strategy_success_rates: Dict[ElixirStrategy, Deque[bool]] = {}  # últimos 20
         
         # Controle de timing
         self.optimal_spending_windows: List[Tuple[float, float, str]] = []  # (start, end, reason)
@@ -104,6 +189,10 @@ class AdvancedElixirController:
         # Análise de valor esperado
         self.card_value_analysis: Dict[Cards, Dict[str, float]] = {}  # carta -> contexto -> valor
         self.combo_elixir_efficiency: Dict[str, float] = {}
+        
+        # Valores de carta já calculados neste tick: (carta, contexto) -> valor
+        # (limpo sempre que elixir ou histórico de valores mudam)
+        self._value_cache: Dict[Tuple[Cards, str], float] = {}
     
     def update_elixir_state(self, our_elixir: int, 
                            enemy_cards_played: List[Tuple[Cards, float]],
@@ -113,112 +202,82 @@ class AdvancedElixirController:
         
         current_time = time.time()
         time_diff = current_time - self.last_update_time
+        self._value_cache.clear()
         
         # Atualizar nosso elixir
         self.our_current_elixir = our_elixir
         
+        # Custos das cartas inimigas, estimados uma vez para todos os usos
+        enemy_spends = [
+            (timestamp, self._estimate_card_cost(card))
+            for card, timestamp in enemy_cards_played
+        ]
+        
         # Calcular elixir inimigo baseado em cartas jogadas
-        self._update_enemy_elixir(enemy_cards_played, time_diff)
+        self._update_enemy_elixir(enemy_spends, time_diff)
         
         # Registrar no histórico
         self.elixir_history.append((current_time, our_elixir, self.enemy_current_elixir))
         
         # Registrar gastos
-        for card, timestamp in our_cards_played:
-            cost = self._estimate_card_cost(card)
-            self.spending_history.append((timestamp, cost, "us"))
-        
-        for card, timestamp in enemy_cards_played:
-            cost = self._estimate_card_cost(card)
-            self.spending_history.append((timestamp, cost, "enemy"))
+        self.spending_history.extend(
+            (timestamp, self._estimate_card_cost(card), "us")
+            for card, timestamp in our_cards_played
+        )
+        self.spending_history.extend(
+            (timestamp, cost, "enemy") for timestamp, cost in enemy_spends
+        )
+        self._enemy_spend_window.extend(enemy_spends)
+        self._enemy_recent_sum += sum(cost for _, cost in enemy_spends)
         
         # Detectar double elixir
-        self._detect_double_elixir(game_time)
+        self._detect_double_elixir(game_time, current_time)
         
         # Analisar vantagens atuais
-        self._analyze_current_advantages()
+        self._analyze_current_advantages(current_time)
         
         # Gerar predições
-        self._generate_elixir_predictions()
+        self._generate_elixir_predictions(current_time)
         
         # Atualizar estratégia
         self._update_optimal_strategy()
         
         self.last_update_time = current_time
     
-    def _update_enemy_elixir(self, enemy_cards: List[Tuple[Cards, float]], time_diff: float):
-        """Atualiza estimativa de elixir inimigo"""
-        
-        # Regeneração natural
-        generation_rate = self.elixir_generation_rate
-        if self.double_elixir_active:
-            generation_rate *= 2
+    def _update_enemy_elixir(self, enemy_spends: List[Tuple[float, int]], time_diff: float):
+        """Atualiza estimativa de elixir inimigo a partir de (timestamp, custo)"""
         
-        elixir_generated = min(10 - self.enemy_current_elixir, time_diff * generation_rate)
-        self.enemy_current_elixir = min(10, self.enemy_current_elixir + elixir_generated)
+        # Regeneração natural (taxa já dobrada por _detect_double_elixir)
+        self.enemy_current_elixir = min(10.0, self.enemy_current_elixir + time_diff * self.elixir_generation_rate)
         
         # Subtrair elixir gasto
-        for card, timestamp in enemy_cards:
-            cost = self._estimate_card_cost(card)
-            self.enemy_current_elixir = max(0, self.enemy_current_elixir - cost)
+        for _, cost in enemy_spends:
+            self.enemy_current_elixir = max(0.0, self.enemy_current_elixir - cost)
     
-    def _estimate_card_cost(self, card: Cards) -> int:
+    @staticmethod
+    def _estimate_card_cost(card: Cards) -> int:
         """Estima custo de elixir de uma carta"""
-        cost_mapping = {
-            # Cartas baratas (1-3)
-            'skeletons': 1, 'ice_spirit': 1, 'heal_spirit': 1,
-            'bats': 2, 'spear_goblins': 2, 'goblins': 2, 'zap': 2,
-            'skeleton_army': 3, 'archers': 3, 'knight': 3, 'arrows': 3,
-            'cannon': 3, 'tombstone': 3, 'bomber': 3,
-            
-            # Cartas médias (4-5)
-            'musketeer': 4, 'minipekka': 4, 'valkyrie': 4, 'hog_rider': 4,
-            'fireball': 4, 'tesla': 4, 'ice_golem': 2, 'poison': 4,
-            'giant': 5, 'wizard': 5, 'balloon': 5, 'inferno_tower': 5,
-            
-            # Cartas caras (6+)
-            'lightning': 6, 'rocket': 6, 'pekka': 7, 'golem': 8,
-            'electro_giant': 8, 'lava_hound': 7, 'mega_knight': 7
-        }
-        
-        card_name = card.name.lower()
-        return cost_mapping.get(card_name, 4)  # Default 4
+        return _CARD_COSTS.get(card, 4)  # Default 4
     
-    def _detect_double_elixir(self, game_time: float):
+    def _detect_double_elixir(self, game_time: float, now: float):
         """Detecta início do double elixir"""
         
         if game_time >= 120 and not self.double_elixir_active:  # 2 minutos
             self.double_elixir_active = True
-            self.double_elixir_start_time = time.time()
+            self.double_elixir_start_time = now
             self.elixir_generation_rate = 2.0
     
-    def _analyze_current_advantages(self):
+    def _analyze_current_advantages(self, now: float):
         """Analisa vantagens de elixir atuais"""
         
-        current_time = time.time()
+        current_time = now
         advantage = self.our_current_elixir - self.enemy_current_elixir
         
-        # Determinar oportunidade baseada na vantagem
-        opportunity = None
-        confidence = 0.5
-        duration = 5.0
-        
-        if advantage >= 4:  # Grande vantagem
-            opportunity = ElixirOpportunity.HEAVY_PUSH
-            confidence = 0.9
-            duration = 8.0
-        elif advantage >= 2:  # Vantagem moderada
-            opportunity = ElixirOpportunity.COUNTER_ATTACK
-            confidence = 0.8
-            duration = 6.0
-        elif advantage <= -4:  # Grande desvantagem
-            opportunity = ElixirOpportunity.DEFENSIVE_SETUP
-            confidence = 0.9
-            duration = 10.0
-        elif advantage <= -2:  # Desvantagem moderada
-            opportunity = ElixirOpportunity.CYCLE_PRESSURE
-            confidence = 0.7
-            duration = 5.0
+        # Determinar oportunidade baseada na vantagem (int() trunca em
+        # direção a zero, preservando os limites >= 2 / <= -2 para frações)
+        opportunity, confidence, duration = _OPPORTUNITY_TABLE[
+            max(-4, min(4, int(advantage))) + 4
+        ]
         
         if opportunity:
             elixir_advantage = ElixirAdvantage(
@@ -231,26 +290,37 @@ class AdvancedElixirController:
                 opportunity=opportunity
             )
             
-            # Adicionar à lista (remover antigas)
-            self.current_advantages = [adv for adv in self.current_advantages 
-                                     if current_time - adv.timestamp < adv.duration_estimate]
+            # Adicionar à fila (remover antigas)
+            self._expire_advantages(current_time)
             self.current_advantages.append(elixir_advantage)
     
-    def _generate_elixir_predictions(self):
+    def _expire_advantages(self, now: float):
+        """Remove do início da fila as vantagens já expiradas"""
+        
+        advantages = self.current_advantages
+        while advantages and now - advantages[0].timestamp >= advantages[0].duration_estimate:
+            advantages.popleft()
+    
+    def _generate_elixir_predictions(self, now: float):
         """Gera predições de elixir futuro"""
         
         self.predicted_states = []
-        current_time = time.time()
         
-        # Predições para próximos 15 segundos
-        for seconds_ahead in [3, 6, 9, 12, 15]:
-            predicted_our = self._predict_our_elixir(seconds_ahead)
-            predicted_enemy = self._predict_enemy_elixir(seconds_ahead)
+        # Predições para próximos 15 segundos, todos os horizontes de uma vez
+        # (a confiança depende só da distância temporal e é pré-calculada)
+        generation_rate, our_spend, enemy_rate = self._prediction_inputs(now)
+        all_our, all_enemy = elixir_horizon_predictions(
+            float(self.our_current_elixir), float(self.enemy_current_elixir),
+            float(generation_rate), _HORIZONS, our_spend, enemy_rate
+        )
+        all_our = all_our.tolist()
+        all_enemy = all_enemy.tolist()
+        
+        for seconds_ahead, predicted_our, predicted_enemy, confidence in zip(
+            PREDICTION_HORIZONS, all_our, all_enemy, _HORIZON_CONFIDENCE
+        ):
             predicted_advantage = predicted_our - predicted_enemy
             
-            # Calcular confiança baseada na distância temporal
-            confidence = max(0.3, 1.0 - (seconds_ahead / 20.0))
-            
             # Determinar ação recomendada
             recommended_action = self._determine_recommended_action(
                 predicted_our, predicted_enemy, predicted_advantage
@@ -267,44 +337,34 @@ class AdvancedElixirController:
             
             self.predicted_states.append(prediction)
     
-    def _predict_our_elixir(self, seconds_ahead: float) -> int:
-        """Prediz nosso elixir em X segundos"""
+    def _prediction_inputs(self, now: float) -> Tuple[float, float, float]:
+        """Taxa de geração, gasto planejado e ritmo de gasto inimigo"""
         
+        # Taxa efetiva: atualizada uma única vez quando o double elixir começa
         generation_rate = self.elixir_generation_rate
-        if self.double_elixir_active:
-            generation_rate = 2.0
-        
-        # Regeneração natural
-        predicted = min(10, self.our_current_elixir + (seconds_ahead * generation_rate))
         
         # Considerar gastos planejados (estimativa conservadora)
+        our_planned_spend = 0.0
         if self.current_strategy == ElixirStrategy.AGGRESSIVE_SPEND:
-            predicted = max(0, predicted - 4)  # Gastar ~4 elixir
+            our_planned_spend = 4.0  # Gastar ~4 elixir
         elif self.current_strategy == ElixirStrategy.CYCLE_FAST:
-            predicted = max(0, predicted - 2)  # Gastar ~2 elixir
+            our_planned_spend = 2.0  # Gastar ~2 elixir
         
-        return int(predicted)
-    
-    def _predict_enemy_elixir(self, seconds_ahead: float) -> int:
-        """Prediz elixir inimigo em X segundos"""
-        
-        generation_rate = self.elixir_generation_rate
-        if self.double_elixir_active:
-            generation_rate = 2.0
-        
-        # Regeneração natural
-        predicted = min(10, self.enemy_current_elixir + (seconds_ahead * generation_rate))
+        # Analisar padrões de gasto inimigo (média da janela recente)
+        self._expire_enemy_window(now)
+        recent_count = len(self._enemy_spend_window)
+        enemy_spend_rate = 0.0
+        if recent_count:
+            enemy_spend_rate = self._enemy_recent_sum / recent_count
         
-        # Analisar padrões de gasto inimigo
-        recent_spending = [spend for timestamp, spend, player in self.spending_history 
-                          if player == "enemy" and time.time() - timestamp < 30]
-        
-        if recent_spending:
-            avg_spending_rate = sum(recent_spending) / len(recent_spending)
-            predicted_spending = avg_spending_rate * (seconds_ahead / 10.0)  # Normalizar
-            predicted = max(0, predicted - predicted_spending)
-        
-        return int(predicted)
+        return generation_rate, our_planned_spend, enemy_spend_rate
+    
+    def _expire_enemy_window(self, now: float):
+        """Remove da janela (e da soma) os gastos inimigos mais antigos que a janela"""
+        window = self._enemy_spend_window
+        while window and now - window[0][0] >= ENEMY_SPENDING_WINDOW:
+            _, amount = window.popleft()
+            self._enemy_recent_sum -= amount
     
     def _determine_recommended_action(self, our_elixir: int, enemy_elixir: int, 
                                     advantage: int) -> ElixirStrategy:
@@ -345,39 +405,29 @@ class AdvancedElixirController:
         else:
             self.current_strategy = ElixirStrategy.WAIT_FOR_ADVANTAGE
     
-    def _get_elixir_state(self, elixir: int) -> ElixirState:
+    @staticmethod
+    def _get_elixir_state(elixir: float) -> ElixirState:
         """Converte valor de elixir para estado"""
         
-        if elixir <= 2:
-            return ElixirState.CRITICAL
-        elif elixir <= 4:
-            return ElixirState.LOW
-        elif elixir <= 6:
-            return ElixirState.MEDIUM
-        elif elixir <= 8:
-            return ElixirState.HIGH
-        else:
-            return ElixirState.FULL
+        # Elixir inimigo pode ser fracionário: arredondar para cima mantém
+        # os mesmos limites (<= 2, <= 4, ...) da comparação direta
+        return _ELIXIR_STATE_LUT[max(0, min(10, math.ceil(elixir)))]
     
     def calculate_card_value(self, card: Cards, context: str = "neutral") -> float:
         """Calcula valor esperado de uma carta no contexto atual"""
         
+        cache_key = (card, context)
+        cached = self._value_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         base_cost = self._estimate_card_cost(card)
         
         # Valor base (custo normalizado)
         base_value = base_cost / 10.0
         
         # Modificadores contextuais
-        context_multipliers = {
-            "attack": 1.2,
-            "defense": 1.1,
-            "counter_attack": 1.5,
-            "emergency": 0.8,  # Menos eficiente sob pressão
-            "advantage": 1.3,  # Mais eficiente com vantagem
-            "disadvantage": 0.9
-        }
-        
-        multiplier = context_multipliers.get(context, 1.0)
+        multiplier = _CONTEXT_MULTIPLIERS.get(context, 1.0)
         
         # Modificadores baseados no estado de elixir
         our_state = self._get_elixir_state(self.our_current_elixir)
@@ -392,13 +442,15 @@ class AdvancedElixirController:
             multiplier *= 1.2  # Todas as cartas são mais valiosas contra inimigo low
         
         # Histórico de eficiência da carta
-        if card in self.card_value_analysis and context in self.card_value_analysis[card]:
-            historical_value = self.card_value_analysis[card][context]
+        context_values = self.card_value_analysis.get(card)
+        historical_value = context_values.get(context) if context_values is not None else None
+        if historical_value is not None:
             # Média ponderada: 70% histórico, 30% cálculo atual
             final_value = (historical_value * 0.7) + (base_value * multiplier * 0.3)
         else:
             final_value = base_value * multiplier
         
+        self._value_cache[cache_key] = final_value
         return final_value
     
     def should_spend_elixir_now(self, card: Cards, context: str = "neutral") -> Tuple[bool, str]:
@@ -441,15 +493,18 @@ class AdvancedElixirController:
             elif advantage.opportunity == ElixirOpportunity.HEAVY_PUSH and card_cost >= 5:
                 return True, "Heavy push opportunity"
         
-        # Decisão padrão baseada na estratégia
-        strategy_decisions = {
-            ElixirStrategy.AGGRESSIVE_SPEND: (True, "Aggressive spending strategy"),
-            ElixirStrategy.PUNISH_OPPONENT: (context == "attack", "Punish opponent strategy"),
-            ElixirStrategy.WAIT_FOR_ADVANTAGE: (card_value > 0.8, "Wait for advantage strategy"),
-            ElixirStrategy.CYCLE_FAST: (card_cost <= 3, "Fast cycle strategy")
-        }
-        
-        return strategy_decisions.get(self.current_strategy, (False, "Unknown strategy"))
+        # Decisão padrão baseada na estratégia (só a condição ativa é avaliada)
+        strategy = self.current_strategy
+        if strategy is ElixirStrategy.AGGRESSIVE_SPEND:
+            return True, "Aggressive spending strategy"
+        elif strategy is ElixirStrategy.PUNISH_OPPONENT:
+            return context == "attack", "Punish opponent strategy"
+        elif strategy is ElixirStrategy.WAIT_FOR_ADVANTAGE:
+            return card_value > 0.8, "Wait for advantage strategy"
+        elif strategy is ElixirStrategy.CYCLE_FAST:
+            return card_cost <= 3, "Fast cycle strategy"
+        
+        return False, "Unknown strategy"
     
     def get_optimal_spending_sequence(self, available_cards: List[Cards], 
                                     target_elixir_spent: int) -> List[Tuple[Cards, float]]:
@@ -459,22 +514,23 @@ class AdvancedElixirController:
         remaining_elixir = self.our_current_elixir
         target_remaining = target_elixir_spent
         
-        # Ordenar cartas por valor/custo
+        # Heap por eficiência (valor/custo): as cartas saem da mais para a
+        # menos eficiente e o restante nunca é ordenado se o alvo for
+        # atingido antes. O índice desempata como a ordenação estável
         card_efficiency = []
-        for card in available_cards:
+        for index, card in enumerate(available_cards):
             cost = self._estimate_card_cost(card)
             value = self.calculate_card_value(card)
             efficiency = value / cost if cost > 0 else 0
-            card_efficiency.append((card, cost, efficiency))
-        
-        # Ordenar por eficiência
-        card_efficiency.sort(key=lambda x: x[2], reverse=True)
+            card_efficiency.append((-efficiency, index, card, cost))
+        heapq.heapify(card_efficiency)
         
         # Selecionar cartas até atingir target
         current_time = time.time()
         delay_accumulator = 0.0
         
-        for card, cost, efficiency in card_efficiency:
+        while card_efficiency:
+            _, _, card, cost = heapq.heappop(card_efficiency)
             if target_remaining >= cost and remaining_elixir >= cost:
                 sequence.append((card, current_time + delay_accumulator))
                 target_remaining -= cost
@@ -490,6 +546,8 @@ class AdvancedElixirController:
                               success: bool, damage_dealt: int = 0):
         """Registra resultado de gasto para aprendizado"""
         
+        self._value_cache.clear()
+        
         # Atualizar análise de valor da carta
         if card not in self.card_value_analysis:
             self.card_value_analysis[card] = {}
@@ -512,66 +570,62 @@ class AdvancedElixirController:
         self.card_value_analysis[card][context] = new_value
         
         # Atualizar taxa de sucesso da estratégia
+        # (a deque mantém apenas os últimos 20 resultados)
         if self.current_strategy not in self.strategy_success_rates:
-            self.strategy_success_rates[self.current_strategy] = []
+            self.strategy_success_rates[self.current_strategy] = deque(maxlen=20)
         
         self.strategy_success_rates[self.current_strategy].append(success)
-        
-        # Manter apenas últimos 20 resultados
-        if len(self.strategy_success_rates[self.current_strategy]) > 20:
-            self.strategy_success_rates[self.current_strategy] = \
-                self.strategy_success_rates[self.current_strategy][-20:]
     
     def get_elixir_recommendations(self) -> Dict[str, any]:
         """Retorna recomendações de elixir atuais"""
         
-        recommendations = {
+        our_elixir = self.our_current_elixir
+        enemy_elixir = self.enemy_current_elixir
+        
+        # Estrutura completa montada numa única expressão
+        return {
             "current_state": {
-                "our_elixir": self.our_current_elixir,
-                "enemy_elixir": self.enemy_current_elixir,
-                "advantage": self.our_current_elixir - self.enemy_current_elixir,
-                "our_state": self._get_elixir_state(self.our_current_elixir).value,
-                "enemy_state": self._get_elixir_state(self.enemy_current_elixir).value
+                "our_elixir": our_elixir,
+                "enemy_elixir": enemy_elixir,
+                "advantage": our_elixir - enemy_elixir,
+                "our_state": self._get_elixir_state(our_elixir).label,
+                "enemy_state": self._get_elixir_state(enemy_elixir).label
             },
             "current_strategy": self.current_strategy.value,
-            "opportunities": [],
-            "predictions": [],
-            "spending_advice": {}
+            # Oportunidades atuais
+            "opportunities": [
+                {
+                    "type": advantage.opportunity.value,
+                    "advantage": advantage.advantage,
+                    "confidence": advantage.confidence,
+                    "duration": advantage.duration_estimate
+                }
+                for advantage in self.current_advantages
+            ],
+            # Predições
+            "predictions": [
+                {
+                    "time_offset": prediction.time_offset,
+                    "predicted_advantage": prediction.predicted_advantage,
+                    "recommended_action": prediction.recommended_action.value,
+                    "confidence": prediction.confidence
+                }
+                for prediction in self.predicted_states
+            ],
+            "spending_advice": self._compute_spending_advice()
         }
+    
+    def _compute_spending_advice(self) -> Dict[str, str]:
+        """Conselhos de gasto (urgência e motivo)"""
         
-        # Oportunidades atuais
-        for advantage in self.current_advantages:
-            recommendations["opportunities"].append({
-                "type": advantage.opportunity.value,
-                "advantage": advantage.advantage,
-                "confidence": advantage.confidence,
-                "duration": advantage.duration_estimate
-            })
-        
-        # Predições
-        for prediction in self.predicted_states:
-            recommendations["predictions"].append({
-                "time_offset": prediction.time_offset,
-                "predicted_advantage": prediction.predicted_advantage,
-                "recommended_action": prediction.recommended_action.value,
-                "confidence": prediction.confidence
-            })
-        
-        # Conselhos de gasto
         if self.our_current_elixir >= 9:
-            recommendations["spending_advice"]["urgency"] = "high"
-            recommendations["spending_advice"]["reason"] = "Prevent elixir leak"
+            return {"urgency": "high", "reason": "Prevent elixir leak"}
         elif self.current_strategy == ElixirStrategy.AGGRESSIVE_SPEND:
-            recommendations["spending_advice"]["urgency"] = "high"
-            recommendations["spending_advice"]["reason"] = "Aggressive spending window"
+            return {"urgency": "high", "reason": "Aggressive spending window"}
         elif self.current_strategy == ElixirStrategy.CONSERVATIVE:
-            recommendations["spending_advice"]["urgency"] = "low"
-            recommendations["spending_advice"]["reason"] = "Conservative approach"
+            return {"urgency": "low", "reason": "Conservative approach"}
         else:
-            recommendations["spending_advice"]["urgency"] = "medium"
-            recommendations["spending_advice"]["reason"] = "Standard play"
-        
-        return recommendations
+            return {"urgency": "medium", "reason": "Standard play"}
     
     def optimize_elixir_efficiency(self):
         """Otimiza eficiência de elixir baseada em dados históricos"""
@@ -590,6 +644,7 @@ class AdvancedElixirController:
                     pass  # Implementar lógica de evitação
         
         # Otimizar valores de cartas baseado em performance
+        self._value_cache.clear()
         for card, contexts in self.card_value_analysis.items():
             for context, value in contexts.items():
                 # Ajustar valores baseado em tendências
@@ -607,7 +662,7 @@ class AdvancedElixirController:
         # Por enquanto, usar estimativa baseada em padrões típicos
         
         if hasattr(self, 'enemy_current_elixir'):
-            return self.enemy_current_elixir
+            return int(self.enemy_current_elixir)
         
         # Estimativa padrão baseada em tempo de jogo
         # Assumir que o inimigo está no mesmo nível de elixir
@@ -6,47 +6,118 @@ Sistema que adapta o timing de combos baseado no contexto do jogo,
 estado do oponente e oportunidades táticas.
 """
 
-from typing import Dict, List, Optional, Tuple, Callable
-from enum import Enum
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, Callable
+from enum import IntEnum
 from dataclasses import dataclass, field
 import time
-import math
+from collections import deque
+from bisect import bisect_right
 
+import numpy as np
+
+from clashroyalebuildabot.core._kernels import combo_timing_kernel
+from clashroyalebuildabot.core._kernels import warm_up_kernels
+from clashroyalebuildabot.core.counters import CARD_IDS
 from clashroyalebuildabot.namespaces.cards import Cards
 
 
-class TimingContext(Enum):
-    """Contextos que afetam o timing"""
-    EARLY_GAME = "early_game"           # Primeiros 60 segundos
-    MID_GAME = "mid_game"               # 60-180 segundos
-    LATE_GAME = "late_game"             # 180+ segundos
-    OVERTIME = "overtime"               # Tempo extra
+class TimingContext(IntEnum):
+    """
+    Contextos que afetam o timing. O valor é a posição do bit do contexto
+    em current_mask (ordem em que update_game_context os detecta).
+    """
+    EARLY_GAME = 0            # Primeiros 60 segundos
+    MID_GAME = 1              # 60-180 segundos
+    LATE_GAME = 2             # 180+ segundos
+    OVERTIME = 3              # Tempo extra
+    
+    ELIXIR_ADVANTAGE = 4      # Vantagem de elixir
+    ELIXIR_DISADVANTAGE = 5   # Desvantagem de elixir
     
-    ELIXIR_ADVANTAGE = "elixir_advantage"     # Vantagem de elixir
-    ELIXIR_DISADVANTAGE = "elixir_disadvantage" # Desvantagem de elixir
+    ENEMY_LOW_ELIXIR = 6      # Inimigo com pouco elixir
+    ENEMY_HIGH_ELIXIR = 7     # Inimigo com muito elixir
     
-    ENEMY_LOW_ELIXIR = "enemy_low_elixir"     # Inimigo com pouco elixir
-    ENEMY_HIGH_ELIXIR = "enemy_high_elixir"   # Inimigo com muito elixir
+    TOWER_DAMAGE = 8          # Torre com pouco HP
+    EQUAL_TOWERS = 9          # Torres equilibradas
     
-    COUNTER_ATTACK = "counter_attack"         # Oportunidade de contra-ataque
-    DEFENSIVE_PRESSURE = "defensive_pressure" # Sob pressão defensiva
+    COUNTER_ATTACK = 10       # Oportunidade de contra-ataque
+    DEFENSIVE_PRESSURE = 11   # Sob pressão defensiva
     
-    TOWER_DAMAGE = "tower_damage"             # Torre com pouco HP
-    EQUAL_TOWERS = "equal_towers"             # Torres equilibradas
+    @property
+    def label(self) -> str:
+        """Nome legível do contexto ("early_game", ...)"""
+        return self.name.lower()
+
+
+# Contextos na ordem dos bits (iterar bits preserva a ordem de detecção)
+_CONTEXT_ORDER: Tuple[TimingContext, ...] = tuple(TimingContext)
+CONTEXT_BIT: Dict[TimingContext, int] = {context: 1 << context for context in TimingContext}
+_BIT_INDEX: Dict[int, int] = {1 << index: index for index in range(len(_CONTEXT_ORDER))}
+
+# Bits já resolvidos, para não consultar CONTEXT_BIT (hash de Enum) a cada tick
+_BIT_EARLY_GAME = CONTEXT_BIT[TimingContext.EARLY_GAME]
+_BIT_MID_GAME = CONTEXT_BIT[TimingContext.MID_GAME]
+_BIT_LATE_GAME = CONTEXT_BIT[TimingContext.LATE_GAME]
+_BIT_OVERTIME = CONTEXT_BIT[TimingContext.OVERTIME]
+_BIT_ELIXIR_ADVANTAGE = CONTEXT_BIT[TimingContext.ELIXIR_ADVANTAGE]
+_BIT_ELIXIR_DISADVANTAGE = CONTEXT_BIT[TimingContext.ELIXIR_DISADVANTAGE]
+_BIT_ENEMY_LOW_ELIXIR = CONTEXT_BIT[TimingContext.ENEMY_LOW_ELIXIR]
+_BIT_ENEMY_HIGH_ELIXIR = CONTEXT_BIT[TimingContext.ENEMY_HIGH_ELIXIR]
+_BIT_TOWER_DAMAGE = CONTEXT_BIT[TimingContext.TOWER_DAMAGE]
+_BIT_EQUAL_TOWERS = CONTEXT_BIT[TimingContext.EQUAL_TOWERS]
+_BIT_COUNTER_ATTACK = CONTEXT_BIT[TimingContext.COUNTER_ATTACK]
+_BIT_DEFENSIVE_PRESSURE = CONTEXT_BIT[TimingContext.DEFENSIVE_PRESSURE]
+
+
+def _context_vector(values: Dict[TimingContext, float], default: float) -> Tuple[float, ...]:
+    """Valores por contexto na ordem dos bits (default onde não há valor)"""
+    return tuple(values.get(context, default) for context in _CONTEXT_ORDER)
+
+
+# Deslocamentos para expandir a máscara num vetor 0/1 (ordem dos bits)
+_CONTEXT_SHIFTS = np.arange(len(_CONTEXT_ORDER), dtype=np.int64)
+
 
+def _cards_mask(cards) -> int:
+    """Bitmask das cartas sobre os IDs de core.counters"""
+    mask = 0
+    for card in cards:
+        mask |= 1 << CARD_IDS[card.name]
+    return mask
 
-class TimingPriority(Enum):
-    """Prioridades de timing"""
-    IMMEDIATE = 1.0      # Executar imediatamente
-    HIGH = 0.8          # Executar em breve
-    MEDIUM = 0.6        # Executar quando conveniente
-    LOW = 0.4           # Executar se necessário
-    WAIT = 0.2          # Aguardar melhor momento
+
+def _set_bit_indices(mask: int):
+    """Índices dos bits ligados na máscara, do menor para o maior"""
+    while mask:
+        low_bit = mask & -mask
+        yield _BIT_INDEX[low_bit]
+        mask ^= low_bit
+
+
+class TimingPriority(IntEnum):
+    """Prioridades de timing (ordenadas: permitem comparar com < e >=)"""
+    WAIT = 0            # Aguardar melhor momento
+    LOW = 1             # Executar se necessário
+    MEDIUM = 2          # Executar quando conveniente
+    HIGH = 3            # Executar em breve
+    IMMEDIATE = 4       # Executar imediatamente
+    
+    @property
+    def weight(self) -> float:
+        """Peso da prioridade (0.2 a 1.0), usado como fator de confiança"""
+        return _PRIORITY_WEIGHTS[self]
+
+
+_PRIORITY_WEIGHTS = (0.2, 0.4, 0.6, 0.8, 1.0)
 
 
 @dataclass
 class TimingWindow:
     """Janela de tempo para execução de combo"""
+    # __slots__ explícito: dataclass(slots=True) exige Python 3.10
+    __slots__ = ("start_time", "end_time", "priority", "context",
+                 "confidence", "reason")
+
     start_time: float
     end_time: float
     priority: TimingPriority
@@ -55,15 +126,31 @@ class TimingWindow:
     reason: str
 
 
-@dataclass
+# Janelas pré-alocadas por gerenciador (o pool cresce se precisar de mais)
+_WINDOW_POOL_SIZE = 32
+
+
+# Campos numéricos das janelas preditas, em ordem de ranking. float64 nos
+# tempos: são timestamps de time.time() (float32 perderia os segundos)
+_WINDOW_DTYPE = np.dtype([
+    ("start", np.float64),
+    ("end", np.float64),
+    ("priority", np.uint8),
+    ("confidence", np.float64),
+])
+
+
+@dataclass(frozen=True)
 class ComboTiming:
-    """Timing específico para um combo"""
+    """
+    Timing específico para um combo. Só os modificadores mudam depois da
+    criação (adaptação por performance), e o dict é alterado no lugar.
+    """
     combo_name: str
-    cards: List[Cards]
+    cards: Tuple[Cards, ...]
     base_delay: float = 0.5  # Delay base entre cartas
     context_modifiers: Dict[TimingContext, float] = field(default_factory=dict)
     elixir_requirements: int = 8
-    optimal_windows: List[TimingWindow] = field(default_factory=list)
     
     def get_adjusted_delay(self, context: TimingContext) -> float:
         """Retorna delay ajustado para o contexto"""
@@ -71,6 +158,68 @@ class ComboTiming:
         return self.base_delay * modifier
 
 
+# Limites de LOW, MEDIUM, HIGH e IMMEDIATE
+_PRIORITY_THRESHOLDS = (0.3, 0.5, 0.7, 0.9)
+
+# Ajustes de prioridade por contexto (ordem dos bits)
+_PRIORITY_DELTAS: Tuple[float, ...] = _context_vector({
+    TimingContext.ENEMY_LOW_ELIXIR: 0.3,
+    TimingContext.COUNTER_ATTACK: 0.25,
+    TimingContext.ELIXIR_ADVANTAGE: 0.2,
+    TimingContext.OVERTIME: 0.15,
+    TimingContext.TOWER_DAMAGE: 0.1,
+    TimingContext.DEFENSIVE_PRESSURE: -0.2,
+    TimingContext.ELIXIR_DISADVANTAGE: -0.3,
+}, 0.0)
+
+# Ajustes de prioridade específicos por combo
+_COMBO_PRIORITY_DELTAS: Dict[str, Tuple[float, ...]] = {
+    "hog_ice_spirit": _context_vector({
+        TimingContext.COUNTER_ATTACK: 0.2,
+        TimingContext.ENEMY_LOW_ELIXIR: 0.3
+    }, 0.0),
+    "giant_musketeer": _context_vector({
+        TimingContext.ELIXIR_ADVANTAGE: 0.2,
+        TimingContext.LATE_GAME: 0.1
+    }, 0.0),
+    "golem_night_witch": _context_vector({
+        TimingContext.EARLY_GAME: -0.3,  # Evitar early game
+        TimingContext.OVERTIME: -0.2     # Evitar overtime
+    }, 0.0),
+}
+
+
+# Custos usados para avaliar as cartas inimigas preditas
+_CARD_COSTS: Dict[Cards, int] = {
+    Cards.SKELETON_ARMY: 3, Cards.GOBLINS: 2, Cards.ARCHERS: 3, Cards.KNIGHT: 3,
+    Cards.MUSKETEER: 4, Cards.MINIPEKKA: 4, Cards.VALKYRIE: 4, Cards.HOG_RIDER: 4,
+    Cards.GIANT: 5, Cards.WIZARD: 5, Cards.PEKKA: 7, Cards.GOLEM: 8,
+    Cards.ARROWS: 3, Cards.FIREBALL: 4, Cards.ZAP: 2, Cards.LIGHTNING: 6,
+}
+
+# Cartas que indicam oportunidade de contra-ataque (pesadas e feitiços
+# caros), como bitmask sobre os IDs de core.counters
+_COUNTER_ATTACK_MASK = 0
+for _card in (Cards.GOLEM, Cards.PEKKA, Cards.ELECTRO_GIANT, Cards.LAVA_HOUND,
+              Cards.LIGHTNING, Cards.ROCKET, Cards.FIREBALL):
+    _COUNTER_ATTACK_MASK |= 1 << CARD_IDS[_card.name]
+del _card
+
+# Prioridade por número de limites atingidos (ver _PRIORITY_THRESHOLDS)
+_PRIORITY_LEVELS = (
+    TimingPriority.WAIT,
+    TimingPriority.LOW,
+    TimingPriority.MEDIUM,
+    TimingPriority.HIGH,
+    TimingPriority.IMMEDIATE,
+)
+
+
+def _priority_from_score(score: float) -> TimingPriority:
+    """Converte a prioridade (0.0 a 1.0+) para o enum"""
+    return _PRIORITY_LEVELS[bisect_right(_PRIORITY_THRESHOLDS, score)]
+
+
 class DynamicTimingManager:
     """Gerenciador principal de timing dinâmico"""
     
@@ -78,20 +227,41 @@ class DynamicTimingManager:
         # Configurações de timing por combo
         self.combo_timings: Dict[str, ComboTiming] = {}
         self._initialize_combo_timings()
+        warm_up_kernels()  # JIT fora do caminho das decisões
         
         # Estado atual do jogo
         self.game_start_time: float = time.time()
-        self.current_contexts: List[TimingContext] = []
+        self._now: float = self.game_start_time  # Relógio do tick atual
+        self.current_mask: int = 0  # Bits de CONTEXT_BIT ativos
         
         # Histórico de execuções
         self.execution_history: List[Tuple[str, float, bool]] = []  # (combo, tempo, sucesso)
         
         # Análise de padrões
-        self.success_rates: Dict[str, Dict[TimingContext, float]] = {}
+        # Últimas 20 execuções por combo/contexto e a soma de sucessos delas
+        self.success_rates: Dict[str, Dict[TimingContext, Deque[bool]]] = {}
+        self._success_sums: Dict[str, Dict[TimingContext, int]] = {}
+        # Mesmos dados em matrizes (combo x contexto) para a adaptação
+        self._success_sum_matrix = np.zeros(self._mods.shape, dtype=np.int32)
+        self._success_count_matrix = np.zeros(self._mods.shape, dtype=np.int32)
         self.optimal_timing_patterns: Dict[str, List[float]] = {}
         
         # Predições de oportunidades
         self.predicted_windows: List[TimingWindow] = []
+        # Campos numéricos das mesmas janelas, para as consultas vetorizadas
+        self._window_table = np.zeros(0, dtype=_WINDOW_DTYPE)
+        # Janelas pré-alocadas, reaproveitadas a cada predição
+        self._window_pool: List[TimingWindow] = [
+            TimingWindow(0.0, 0.0, TimingPriority.LOW, TimingContext.EARLY_GAME, 0.0, "")
+            for _ in range(_WINDOW_POOL_SIZE)
+        ]
+        self._window_pool_used = 0
+        self._window_candidates: List[TimingWindow] = []
+        self._windows_version = 0  # Incrementado a cada predição
+        
+        # Recomendações já montadas e a chave (máscara, versão das janelas)
+        self._recommendations_cache: Optional[Dict[str, any]] = None
+        self._recommendations_key: Optional[Tuple[int, int]] = None
         
     def _initialize_combo_timings(self):
         """Inicializa configurações de timing para combos conhecidos"""
@@ -99,7 +269,7 @@ class DynamicTimingManager:
         # Giant + Musketeer
         self.combo_timings["giant_musketeer"] = ComboTiming(
             combo_name="giant_musketeer",
-            cards=[Cards.GIANT, Cards.MUSKETEER],
+            cards=(Cards.GIANT, Cards.MUSKETEER),
             base_delay=1.5,  # Esperar Giant avançar um pouco
             context_modifiers={
                 TimingContext.EARLY_GAME: 1.2,      # Mais cauteloso
@@ -115,7 +285,7 @@ class DynamicTimingManager:
         # Hog Rider + Ice Spirit
         self.combo_timings["hog_ice_spirit"] = ComboTiming(
             combo_name="hog_ice_spirit",
-            cards=[Cards.HOG_RIDER, Cards.ICE_SPIRIT],
+            cards=(Cards.HOG_RIDER, Cards.ICE_SPIRIT),
             base_delay=0.3,  # Timing muito rápido
             context_modifiers={
                 TimingContext.EARLY_GAME: 1.0,
@@ -131,7 +301,7 @@ class DynamicTimingManager:
         # Golem + Night Witch
         self.combo_timings["golem_night_witch"] = ComboTiming(
             combo_name="golem_night_witch",
-            cards=[Cards.GOLEM, Cards.NIGHT_WITCH],
+            cards=(Cards.GOLEM, Cards.NIGHT_WITCH),
             base_delay=2.0,  # Esperar Golem se posicionar
             context_modifiers={
                 TimingContext.EARLY_GAME: 1.5,      # Muito cauteloso
@@ -147,7 +317,7 @@ class DynamicTimingManager:
         # LavaLoon
         self.combo_timings["lava_balloon"] = ComboTiming(
             combo_name="lava_balloon",
-            cards=[Cards.LAVA_HOUND, Cards.BALLOON],
+            cards=(Cards.LAVA_HOUND, Cards.BALLOON),
             base_delay=3.0,  # Esperar Lava Hound avançar
             context_modifiers={
                 TimingContext.EARLY_GAME: 1.3,
@@ -163,7 +333,7 @@ class DynamicTimingManager:
         # Spell Bait Combo
         self.combo_timings["goblin_barrel_princess"] = ComboTiming(
             combo_name="goblin_barrel_princess",
-            cards=[Cards.PRINCESS, Cards.GOBLIN_BARREL],
+            cards=(Cards.PRINCESS, Cards.GOBLIN_BARREL),
             base_delay=1.0,
             context_modifiers={
                 TimingContext.EARLY_GAME: 1.2,
@@ -174,65 +344,107 @@ class DynamicTimingManager:
             },
             elixir_requirements=6
         )
+        
+        self._build_combo_arrays()
     
-    def update_game_context(self, 
-                          game_time: float,
-                          our_elixir: int,
-                          enemy_elixir: int,
-                          our_tower_hp: List[int],
-                          enemy_tower_hp: List[int],
-                          recent_enemy_plays: List[Cards],
-                          elixir_advantage: int):
-        """Atualiza contexto atual do jogo"""
+    def _build_combo_arrays(self):
+        """
+        Materializa os ComboTiming em arrays paralelos (uma linha por combo,
+        colunas na ordem dos bits de contexto). Deve ser chamado de novo
+        sempre que context_modifiers mudar.
+        """
+        timings = list(self.combo_timings.values())
+        self._combo_index: Dict[str, int] = {
+            name: index for index, name in enumerate(self.combo_timings)
+        }
+        self._base_delays = np.array([t.base_delay for t in timings], dtype=np.float64)
+        self._elixir_reqs = np.array([t.elixir_requirements for t in timings], dtype=np.int16)
+        self._card_masks: List[int] = [_cards_mask(t.cards) for t in timings]
+        # Modificadores de delay (1.0 onde o combo não tem ajuste)
+        self._mods = np.array(
+            [_context_vector(t.context_modifiers, 1.0) for t in timings], dtype=np.float64
+        )
+        
+        # Matriz (combo x contexto) dos ajustes de prioridade específicos
+        # de cada combo; a última linha, zerada, atende combos sem entrada
+        zeros = (0.0,) * len(_CONTEXT_ORDER)
+        rows = [_COMBO_PRIORITY_DELTAS.get(name, zeros) for name in self.combo_timings]
+        rows.append(zeros)
+        self._priority_matrix = np.array(rows, dtype=np.float64)
         
-        self.current_contexts = []
+        # Prioridade por (linha da matriz, máscara de contextos); no máximo
+        # 2^12 máscaras por linha, então o cache não precisa de limite
+        self._priority_cache: Dict[Tuple[int, int], TimingPriority] = {}
+    
+    def update_game_context(self, 
+                            game_time: float,
+                            our_elixir: int,
+                            enemy_elixir: int,
+                            our_tower_hp: Sequence[int],
+                            enemy_tower_hp: Sequence[int],
+                            recent_enemy_plays: List[Cards],
+                            elixir_advantage: int,
+                            now: Optional[float] = None):
+        """
+        Atualiza contexto atual do jogo.
+        `now` é o relógio do tick (time.time()), reutilizado pelos demais
+        métodos até a próxima atualização.
+        """
+        
+        self._now = time.time() if now is None else now
+        
+        mask = 0
         
         # Contexto temporal
         if game_time < 60:
-            self.current_contexts.append(TimingContext.EARLY_GAME)
+            mask |= _BIT_EARLY_GAME
         elif game_time < 180:
-            self.current_contexts.append(TimingContext.MID_GAME)
+            mask |= _BIT_MID_GAME
         elif game_time < 300:
-            self.current_contexts.append(TimingContext.LATE_GAME)
+            mask |= _BIT_LATE_GAME
         else:
-            self.current_contexts.append(TimingContext.OVERTIME)
+            mask |= _BIT_OVERTIME
         
         # Contexto de elixir
         if elixir_advantage >= 3:
-            self.current_contexts.append(TimingContext.ELIXIR_ADVANTAGE)
+            mask |= _BIT_ELIXIR_ADVANTAGE
         elif elixir_advantage <= -3:
-            self.current_contexts.append(TimingContext.ELIXIR_DISADVANTAGE)
+            mask |= _BIT_ELIXIR_DISADVANTAGE
         
         if enemy_elixir <= 3:
-            self.current_contexts.append(TimingContext.ENEMY_LOW_ELIXIR)
+            mask |= _BIT_ENEMY_LOW_ELIXIR
         elif enemy_elixir >= 8:
-            self.current_contexts.append(TimingContext.ENEMY_HIGH_ELIXIR)
+            mask |= _BIT_ENEMY_HIGH_ELIXIR
         
         # Contexto de torres
         min_our_hp = min(our_tower_hp) if our_tower_hp else 100
         min_enemy_hp = min(enemy_tower_hp) if enemy_tower_hp else 100
         
         if min_our_hp < 500 or min_enemy_hp < 500:
-            self.current_contexts.append(TimingContext.TOWER_DAMAGE)
+            mask |= _BIT_TOWER_DAMAGE
         else:
-            self.current_contexts.append(TimingContext.EQUAL_TOWERS)
+            mask |= _BIT_EQUAL_TOWERS
         
         # Contexto tático
         if len(recent_enemy_plays) > 0 and self._is_counter_attack_opportunity(recent_enemy_plays):
-            self.current_contexts.append(TimingContext.COUNTER_ATTACK)
+            mask |= _BIT_COUNTER_ATTACK
         
         if our_elixir < 5 and enemy_elixir > 7:
-            self.current_contexts.append(TimingContext.DEFENSIVE_PRESSURE)
+            mask |= _BIT_DEFENSIVE_PRESSURE
+        
+        self.current_mask = mask
     
-    def _is_counter_attack_opportunity(self, recent_plays: List[Cards]) -> bool:
+    @property
+    def current_contexts(self) -> List[TimingContext]:
+        """Contextos ativos, na ordem em que foram detectados"""
+        return [_CONTEXT_ORDER[index] for index in _set_bit_indices(self.current_mask)]
+    
+    @staticmethod
+    def _is_counter_attack_opportunity(recent_plays: List[Cards]) -> bool:
         """Determina se há oportunidade de contra-ataque"""
         
-        # Cartas que indicam oportunidade de contra-ataque
-        heavy_cards = [Cards.GOLEM, Cards.PEKKA, Cards.ELECTRO_GIANT, Cards.LAVA_HOUND]
-        expensive_spells = [Cards.LIGHTNING, Cards.ROCKET, Cards.FIREBALL]
-        
         for card in recent_plays[-2:]:  # Últimas 2 cartas
-            if card in heavy_cards or card in expensive_spells:
+            if _COUNTER_ATTACK_MASK >> CARD_IDS[card.name] & 1:
                 return True
         
         return False
@@ -242,103 +454,94 @@ class DynamicTimingManager:
                              our_elixir: int) -> Optional[Tuple[float, TimingPriority]]:
         """Calcula timing ótimo para um combo específico"""
         
-        if combo_name not in self.combo_timings:
+        index = self._combo_index.get(combo_name)
+        if index is None:
             return None
         
-        combo_timing = self.combo_timings[combo_name]
-        
-        # Verificar se temos as cartas necessárias
-        if not all(card in available_cards for card in combo_timing.cards):
-            return None
-        
-        # Verificar se temos elixir suficiente
-        if our_elixir < combo_timing.elixir_requirements:
+        # Elixir suficiente e cartas necessárias (subconjunto em bitmask),
+        # numa única guarda; o teste barato de elixir vem primeiro
+        card_mask = self._card_masks[index]
+        if (our_elixir < self._elixir_reqs[index]
+                or (_cards_mask(available_cards) & card_mask) != card_mask):
             return None
         
-        # Calcular delay baseado no contexto atual
-        total_delay = combo_timing.base_delay
-        context_multiplier = 1.0
-        
-        for context in self.current_contexts:
-            if context in combo_timing.context_modifiers:
-                context_multiplier *= combo_timing.context_modifiers[context]
-        
-        adjusted_delay = total_delay * context_multiplier
-        
-        # Calcular prioridade baseada no contexto
-        priority = self._calculate_combo_priority(combo_name)
+        # Delay baseado no contexto atual, num único kernel
+        adjusted_delay = combo_timing_kernel(
+            self._mods[index], self._base_delays[index], self.current_mask
+        )
         
-        return (adjusted_delay, priority)
+        return (float(adjusted_delay), self._row_priority(index))
     
     def _calculate_combo_priority(self, combo_name: str) -> TimingPriority:
         """Calcula prioridade de execução do combo"""
         
-        base_priority = 0.6  # Prioridade média
-        
-        # Ajustes baseados no contexto
-        for context in self.current_contexts:
-            if context == TimingContext.ENEMY_LOW_ELIXIR:
-                base_priority += 0.3
-            elif context == TimingContext.COUNTER_ATTACK:
-                base_priority += 0.25
-            elif context == TimingContext.ELIXIR_ADVANTAGE:
-                base_priority += 0.2
-            elif context == TimingContext.OVERTIME:
-                base_priority += 0.15
-            elif context == TimingContext.TOWER_DAMAGE:
-                base_priority += 0.1
-            elif context == TimingContext.DEFENSIVE_PRESSURE:
-                base_priority -= 0.2
-            elif context == TimingContext.ELIXIR_DISADVANTAGE:
-                base_priority -= 0.3
-        
-        # Ajustes específicos por combo
-        combo_adjustments = {
-            "hog_ice_spirit": {
-                TimingContext.COUNTER_ATTACK: 0.2,
-                TimingContext.ENEMY_LOW_ELIXIR: 0.3
-            },
-            "giant_musketeer": {
-                TimingContext.ELIXIR_ADVANTAGE: 0.2,
-                TimingContext.LATE_GAME: 0.1
-            },
-            "golem_night_witch": {
-                TimingContext.EARLY_GAME: -0.3,  # Evitar early game
-                TimingContext.OVERTIME: -0.2     # Evitar overtime
-            }
-        }
-        
-        if combo_name in combo_adjustments:
-            for context in self.current_contexts:
-                if context in combo_adjustments[combo_name]:
-                    base_priority += combo_adjustments[combo_name][context]
-        
-        # Converter para enum
-        if base_priority >= 0.9:
-            return TimingPriority.IMMEDIATE
-        elif base_priority >= 0.7:
-            return TimingPriority.HIGH
-        elif base_priority >= 0.5:
-            return TimingPriority.MEDIUM
-        elif base_priority >= 0.3:
-            return TimingPriority.LOW
-        else:
-            return TimingPriority.WAIT
+        row = self._combo_index.get(combo_name, len(self._combo_index))
+        return self._row_priority(row)
+    
+    def _row_priority(self, row: int) -> TimingPriority:
+        """Prioridade da linha `row` da matriz para os contextos atuais"""
+        
+        key = (row, self.current_mask)
+        priority = self._priority_cache.get(key)
+        if priority is None:
+            # Vetor 0/1 dos contextos ativos, só montado quando falta no cache
+            active = np.flatnonzero((self.current_mask >> _CONTEXT_SHIFTS) & 1).tolist()
+            combo_deltas = self._priority_matrix[row]
+            
+            # Soma em float, na mesma ordem do cálculo original: primeiro os
+            # ajustes genéricos, depois os do combo (os limites dependem disso)
+            base_priority = 0.6  # Prioridade média
+            for index in active:
+                base_priority += _PRIORITY_DELTAS[index]
+            for index in active:
+                base_priority += combo_deltas[index]
+            
+            # Converter para enum
+            priority = _priority_from_score(base_priority)
+            self._priority_cache[key] = priority
+        return priority
+    
+    def _pooled_window(self, start_time: float, end_time: float,
+                       priority: TimingPriority, context: TimingContext,
+                       confidence: float, reason: str) -> TimingWindow:
+        """Próxima janela livre do pool (cresce se acabar), já preenchida"""
+        
+        if self._window_pool_used == len(self._window_pool):
+            self._window_pool.append(
+                TimingWindow(start_time, end_time, priority, context, confidence, reason)
+            )
+            self._window_pool_used += 1
+            return self._window_pool[-1]
+        
+        window = self._window_pool[self._window_pool_used]
+        self._window_pool_used += 1
+        window.start_time = start_time
+        window.end_time = end_time
+        window.priority = priority
+        window.context = context
+        window.confidence = confidence
+        window.reason = reason
+        return window
     
     def predict_optimal_windows(self, 
                               enemy_elixir_prediction: List[Tuple[float, int]],
                               enemy_card_predictions: List[Tuple[Cards, float]]) -> List[TimingWindow]:
-        """Prediz janelas ótimas para execução de combos"""
+        """
+        Prediz janelas ótimas para execução de combos.
+        As janelas vêm do pool e valem até a próxima chamada.
+        """
         
-        windows = []
-        current_time = time.time()
+        self._window_pool_used = 0
+        windows = self._window_candidates
+        windows.clear()
+        current_time = self._now
         
         # Analisar predições de elixir inimigo
         for time_offset, predicted_elixir in enemy_elixir_prediction:
             future_time = current_time + time_offset
             
             if predicted_elixir <= 3:  # Inimigo com pouco elixir
-                window = TimingWindow(
+                window = self._pooled_window(
                     start_time=future_time,
                     end_time=future_time + 5.0,  # Janela de 5 segundos
                     priority=TimingPriority.HIGH,
@@ -354,7 +557,7 @@ class DynamicTimingManager:
                 # Se carta cara for predita, criar janela de contra-ataque
                 card_cost = self._estimate_card_cost(card)
                 if card_cost >= 6:
-                    window = TimingWindow(
+                    window = self._pooled_window(
                         start_time=current_time + 2.0,  # Após carta ser jogada
                         end_time=current_time + 8.0,
                         priority=TimingPriority.HIGH,
@@ -364,21 +567,31 @@ class DynamicTimingManager:
                     )
                     windows.append(window)
         
-        # Ordenar por prioridade e confiança
-        windows.sort(key=lambda w: (w.priority.value, w.confidence), reverse=True)
-        
-        self.predicted_windows = windows[:5]  # Manter apenas top 5
+        # Manter apenas as 5 melhores por prioridade e confiança
+        # (lexsort estável: empates mantêm a ordem de criação)
+        table = np.fromiter(
+            ((w.start_time, w.end_time, w.priority, w.confidence) for w in windows),
+            dtype=_WINDOW_DTYPE, count=len(windows)
+        )
+        order = np.lexsort((-table["confidence"], -table["priority"].astype(np.int16)))[:5]
+        self.predicted_windows = [windows[i] for i in order.tolist()]
+        self._window_table = table[order]
+        self._windows_version += 1
         return self.predicted_windows
     
-    def _estimate_card_cost(self, card: Cards) -> int:
+    def _active_window(self, current_time: float) -> Optional[TimingWindow]:
+        """Janela predita mais bem ranqueada que contém current_time"""
+        
+        table = self._window_table
+        hits = np.flatnonzero((table["start"] <= current_time) & (table["end"] >= current_time))
+        if hits.size == 0:
+            return None
+        return self.predicted_windows[hits[0]]
+    
+    @staticmethod
+    def _estimate_card_cost(card: Cards) -> int:
         """Estima custo de elixir de uma carta"""
-        cost_mapping = {
-            'skeleton_army': 3, 'goblins': 2, 'archers': 3, 'knight': 3,
-            'musketeer': 4, 'minipekka': 4, 'valkyrie': 4, 'hog_rider': 4,
-            'giant': 5, 'wizard': 5, 'pekka': 7, 'golem': 8,
-            'arrows': 3, 'fireball': 4, 'zap': 2, 'lightning': 6,
-        }
-        return cost_mapping.get(card.name.lower(), 4)
+        return _CARD_COSTS.get(card, 4)  # Default 4
     
     def should_execute_combo_now(self, combo_name: str,
                                available_cards: List[Cards],
@@ -393,18 +606,17 @@ class DynamicTimingManager:
         delay, priority = timing_result
         
         # Decisão baseada na prioridade
-        if priority == TimingPriority.IMMEDIATE:
+        if priority is TimingPriority.IMMEDIATE:
             return True, "Immediate execution required"
-        elif priority == TimingPriority.HIGH:
+        elif priority is TimingPriority.HIGH:
             # Verificar se estamos em janela ótima
-            current_time = time.time()
-            for window in self.predicted_windows:
-                if window.start_time <= current_time <= window.end_time:
-                    return True, f"Optimal window: {window.reason}"
+            window = self._active_window(self._now)
+            if window is not None:
+                return True, f"Optimal window: {window.reason}"
             return True, "High priority execution"
-        elif priority == TimingPriority.MEDIUM:
+        elif priority is TimingPriority.MEDIUM:
             # Executar se não há riscos óbvios
-            if TimingContext.DEFENSIVE_PRESSURE not in self.current_contexts:
+            if not self.current_mask & _BIT_DEFENSIVE_PRESSURE:
                 return True, "Medium priority, safe to execute"
             return False, "Medium priority but under defensive pressure"
         else:
@@ -413,64 +625,74 @@ class DynamicTimingManager:
     def record_combo_execution(self, combo_name: str, success: bool):
         """Registra execução de combo para aprendizado"""
         
-        current_time = time.time()
+        current_time = self._now
         self.execution_history.append((combo_name, current_time, success))
         
         # Atualizar taxas de sucesso por contexto
-        if combo_name not in self.success_rates:
-            self.success_rates[combo_name] = {}
-        
-        for context in self.current_contexts:
-            if context not in self.success_rates[combo_name]:
-                self.success_rates[combo_name][context] = []
+        combo_rates = self.success_rates.setdefault(combo_name, {})
+        combo_sums = self._success_sums.setdefault(combo_name, {})
+        index = self._combo_index.get(combo_name)
+        
+        for column in _set_bit_indices(self.current_mask):
+            context = _CONTEXT_ORDER[column]
+            results = combo_rates.get(context)
+            if results is None:
+                # Manter apenas últimas 20 execuções por contexto
+                results = combo_rates[context] = deque(maxlen=20)
+                combo_sums[context] = 0
             
-            self.success_rates[combo_name][context].append(success)
+            # A deque descarta a execução mais antiga quando está cheia
+            if len(results) == results.maxlen:
+                combo_sums[context] -= results[0]
+            results.append(success)
+            combo_sums[context] += success
             
-            # Manter apenas últimas 20 execuções por contexto
-            if len(self.success_rates[combo_name][context]) > 20:
-                self.success_rates[combo_name][context] = \
-                    self.success_rates[combo_name][context][-20:]
+            if index is not None:
+                self._success_sum_matrix[index, column] = combo_sums[context]
+                self._success_count_matrix[index, column] = len(results)
     
     def get_combo_success_rate(self, combo_name: str, context: TimingContext) -> float:
         """Retorna taxa de sucesso de um combo em um contexto específico"""
         
-        if (combo_name not in self.success_rates or 
-            context not in self.success_rates[combo_name]):
-            return 0.5  # Taxa neutra se não há dados
-        
-        results = self.success_rates[combo_name][context]
+        results = self.success_rates.get(combo_name, {}).get(context)
         if not results:
-            return 0.5
+            return 0.5  # Taxa neutra se não há dados
         
-        return sum(results) / len(results)
+        return self._success_sums[combo_name][context] / len(results)
     
     def adapt_timing_based_on_performance(self):
         """Adapta timing baseado na performance histórica"""
         
-        for combo_name, combo_timing in self.combo_timings.items():
-            for context in TimingContext:
-                success_rate = self.get_combo_success_rate(combo_name, context)
-                
-                # Ajustar modificadores baseado na taxa de sucesso
-                if success_rate < 0.3:  # Taxa muito baixa
-                    # Tornar mais conservador
-                    if context in combo_timing.context_modifiers:
-                        combo_timing.context_modifiers[context] *= 1.2
-                    else:
-                        combo_timing.context_modifiers[context] = 1.2
-                        
-                elif success_rate > 0.8:  # Taxa muito alta
-                    # Tornar mais agressivo
-                    if context in combo_timing.context_modifiers:
-                        combo_timing.context_modifiers[context] *= 0.9
-                    else:
-                        combo_timing.context_modifiers[context] = 0.9
+        # Taxas de sucesso (combo x contexto); neutras onde não há dados
+        rates = np.divide(
+            self._success_sum_matrix, self._success_count_matrix,
+            out=np.full(self._mods.shape, 0.5),
+            where=self._success_count_matrix > 0
+        )
+        
+        # Taxa muito baixa: mais conservador; taxa muito alta: mais agressivo
+        factors = np.where(rates < 0.3, 1.2, np.where(rates > 0.8, 0.9, 1.0))
+        rows, cols = np.nonzero(factors != 1.0)
+        self._mods[rows, cols] *= factors[rows, cols]
+        
+        # Refletir os novos modificadores nos ComboTiming
+        timings = list(self.combo_timings.values())
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            timings[row].context_modifiers[_CONTEXT_ORDER[col]] = float(self._mods[row, col])
     
     def get_timing_recommendations(self) -> Dict[str, any]:
-        """Retorna recomendações de timing atuais"""
+        """
+        Retorna recomendações de timing atuais.
+        O dict é reaproveitado enquanto contextos e janelas não mudam;
+        quem precisar alterá-lo deve fazer uma cópia.
+        """
+        
+        cache_key = (self.current_mask, self._windows_version)
+        if self._recommendations_key == cache_key:
+            return self._recommendations_cache
         
         recommendations = {
-            "current_contexts": [ctx.value for ctx in self.current_contexts],
+            "current_contexts": [ctx.label for ctx in self.current_contexts],
             "optimal_combos": [],
             "predicted_windows": [],
             "timing_advice": {}
@@ -480,11 +702,11 @@ class DynamicTimingManager:
         for combo_name in self.combo_timings.keys():
             priority = self._calculate_combo_priority(combo_name)
             
-            if priority.value >= 0.6:  # Medium ou maior
+            if priority >= TimingPriority.MEDIUM:
                 recommendations["optimal_combos"].append({
                     "combo": combo_name,
                     "priority": priority.name,
-                    "priority_value": priority.value
+                    "priority_value": priority.weight
                 })
         
         # Adicionar janelas preditas
@@ -493,31 +715,36 @@ class DynamicTimingManager:
                 "start_time": window.start_time,
                 "end_time": window.end_time,
                 "priority": window.priority.name,
-                "context": window.context.value,
+                "context": window.context.label,
                 "confidence": window.confidence,
                 "reason": window.reason
             })
         
         # Conselhos gerais de timing
-        if TimingContext.ENEMY_LOW_ELIXIR in self.current_contexts:
+        mask = self.current_mask
+        if mask & _BIT_ENEMY_LOW_ELIXIR:
             recommendations["timing_advice"]["general"] = "Aggressive timing - enemy has low elixir"
-        elif TimingContext.DEFENSIVE_PRESSURE in self.current_contexts:
+        elif mask & _BIT_DEFENSIVE_PRESSURE:
             recommendations["timing_advice"]["general"] = "Conservative timing - under pressure"
-        elif TimingContext.ELIXIR_ADVANTAGE in self.current_contexts:
+        elif mask & _BIT_ELIXIR_ADVANTAGE:
             recommendations["timing_advice"]["general"] = "Moderate aggression - elixir advantage"
         else:
             recommendations["timing_advice"]["general"] = "Standard timing - balanced situation"
         
+        self._recommendations_cache = recommendations
+        self._recommendations_key = cache_key
         return recommendations
     
     def get_available_combos(self, available_cards: List[Cards]) -> List[Dict]:
         """Retorna combos disponíveis com as cartas atuais"""
         
         available_combos = []
+        hand_mask = _cards_mask(available_cards)
         
         for combo_name, combo_timing in self.combo_timings.items():
-            # Verificar se temos as cartas necessárias
-            if all(card in available_cards for card in combo_timing.cards):
+            # Verificar se temos as cartas necessárias (subconjunto em bitmask)
+            card_mask = self._card_masks[self._combo_index[combo_name]]
+            if (hand_mask & card_mask) == card_mask:
                 # Calcular confiança baseada no contexto atual
                 confidence = 0.5  # Base
                 
@@ -528,7 +755,7 @@ class DynamicTimingManager:
                 
                 # Ajustar baseado na prioridade
                 priority = self._calculate_combo_priority(combo_name)
-                confidence *= priority.value
+                confidence *= priority.weight
                 
                 available_combos.append({
                     "name": combo_name,
@@ -552,11 +779,12 @@ class DynamicTimingManager:
         delay = 0.5  # Delay padrão
         
         # Ajustar baseado no contexto
-        if TimingContext.ENEMY_LOW_ELIXIR in self.current_contexts:
+        mask = self.current_mask
+        if mask & _BIT_ENEMY_LOW_ELIXIR:
             delay = 0.2  # Executar rapidamente
-        elif TimingContext.DEFENSIVE_PRESSURE in self.current_contexts:
+        elif mask & _BIT_DEFENSIVE_PRESSURE:
             delay = 1.0  # Esperar mais
-        elif TimingContext.ELIXIR_ADVANTAGE in self.current_contexts:
+        elif mask & _BIT_ELIXIR_ADVANTAGE:
             delay = 0.3  # Executar moderadamente rápido
         
         # Ajustar baseado na vantagem de elixir
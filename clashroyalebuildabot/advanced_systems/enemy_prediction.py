@@ -6,16 +6,142 @@ Sistema que rastreia cartas inimigas jogadas e prediz o deck completo do oponent
 Permite antecipar ataques e preparar defesas específicas.
 """
 
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Deque, Dict, FrozenSet, List, Set, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
+from bisect import bisect_left
+from operator import attrgetter
+import heapq
 import time
 import math
 
+import numpy as np
+
+from clashroyalebuildabot.core._kernels import card_set_distance
+from clashroyalebuildabot.core._kernels import cycle_repeat_window
+from clashroyalebuildabot.core._kernels import warm_up_kernels
+from clashroyalebuildabot.core.counters import CARD_IDS
 from clashroyalebuildabot.namespaces.cards import Cards
 
 
+# Custos conhecidos das cartas inimigas
+_CARD_COSTS: Dict[Cards, int] = {
+    # Cartas baratas (1-3)
+    Cards.SKELETON_ARMY: 3, Cards.GOBLINS: 2, Cards.ARCHERS: 3, Cards.KNIGHT: 3,
+    Cards.ICE_SPIRIT: 1, Cards.SKELETONS: 1, Cards.BATS: 2, Cards.SPEAR_GOBLINS: 2,
+    
+    # Cartas médias (4-5)
+    Cards.MUSKETEER: 4, Cards.MINIPEKKA: 4, Cards.VALKYRIE: 4, Cards.HOG_RIDER: 4,
+    Cards.GIANT: 5, Cards.WIZARD: 5, Cards.BOMBER: 3, Cards.CANNON: 3,
+    
+    # Cartas caras (6+)
+    Cards.PEKKA: 7, Cards.GOLEM: 8, Cards.ELECTRO_GIANT: 8, Cards.MEGA_KNIGHT: 7,
+    Cards.LAVA_HOUND: 7, Cards.BALLOON: 5,
+    
+    # Feitiços
+    Cards.ARROWS: 3, Cards.FIREBALL: 4, Cards.ZAP: 2, Cards.LIGHTNING: 6,
+    Cards.ROCKET: 6, Cards.FREEZE: 4, Cards.RAGE: 2, Cards.POISON: 4
+}
+
+# Tabela menor usada pelo rastreador de elixir inimigo
+_ELIXIR_TRACKER_COSTS: Dict[Cards, int] = {
+    Cards.SKELETON_ARMY: 3, Cards.GOBLINS: 2, Cards.ARCHERS: 3, Cards.KNIGHT: 3,
+    Cards.MUSKETEER: 4, Cards.MINIPEKKA: 4, Cards.VALKYRIE: 4, Cards.HOG_RIDER: 4,
+    Cards.GIANT: 5, Cards.WIZARD: 5, Cards.PEKKA: 7, Cards.GOLEM: 8,
+    Cards.ARROWS: 3, Cards.FIREBALL: 4, Cards.ZAP: 2, Cards.LIGHTNING: 6,
+}
+
+
+# Tamanho máximo dos históricos (jogadas e elixir). Uma partida tem bem
+# menos jogadas que isso; o limite só evita crescimento sem fim
+HISTORY_LIMIT = 512
+
+# Cartas consideradas na análise de ciclo e maior janela de repetição
+# procurada entre elas (as últimas i cartas iguais às i anteriores)
+CYCLE_LENGTH = 8
+_CYCLE_MAX_WINDOW = 4
+# Quantidade de IDs possíveis (tamanho dos arrays de presença)
+_CARD_ID_COUNT = len(CARD_IDS)
+
+
+# Cartas indicadoras de arquétipos (a ordem decide empates de score)
+_ARCHETYPE_INDICATORS: Dict[str, FrozenSet[Cards]] = {
+    'giant_beatdown': frozenset([Cards.GIANT, Cards.MUSKETEER, Cards.BOMBER]),
+    'hog_cycle': frozenset([Cards.HOG_RIDER, Cards.ICE_SPIRIT, Cards.CANNON]),
+    'golem_beatdown': frozenset([Cards.GOLEM, Cards.NIGHT_WITCH, Cards.BABY_DRAGON]),
+    'pekka_bridge_spam': frozenset([Cards.PEKKA, Cards.BATTLE_RAM, Cards.BANDIT]),
+    'lava_hound': frozenset([Cards.LAVA_HOUND, Cards.BALLOON, Cards.MINIONS]),
+    'spell_bait': frozenset([Cards.GOBLIN_BARREL, Cards.PRINCESS, Cards.KNIGHT]),
+    'x_bow': frozenset([Cards.X_BOW, Cards.TESLA, Cards.ARCHERS]),
+}
+
+
+def _card_bit(card: Cards) -> int:
+    """Bit da carta nas máscaras de cartas vistas (posição = ID da carta)"""
+    return 1 << CARD_IDS[card.name]
+
+
+# Os mesmos indicadores como máscaras de bits, na mesma ordem
+_INDICATOR_MASKS: Dict[str, int] = {
+    archetype: sum(map(_card_bit, indicators))
+    for archetype, indicators in _ARCHETYPE_INDICATORS.items()
+}
+
+
+# Cartas comuns por arquétipo, em ordem, como frozenset e com a posição
+# de cada carta na ordem
+_ARCHETYPE_CARDS_ORDERED: Dict[str, Tuple[Cards, ...]] = {
+    'giant_beatdown': (Cards.GIANT, Cards.MUSKETEER, Cards.BOMBER, Cards.ARROWS),
+    'hog_cycle': (Cards.HOG_RIDER, Cards.ICE_SPIRIT, Cards.CANNON, Cards.ARCHERS),
+    'golem_beatdown': (Cards.GOLEM, Cards.NIGHT_WITCH, Cards.BABY_DRAGON, Cards.LIGHTNING),
+    'pekka_bridge_spam': (Cards.PEKKA, Cards.BATTLE_RAM, Cards.BANDIT, Cards.ZAP),
+    'lava_hound': (Cards.LAVA_HOUND, Cards.BALLOON, Cards.MINIONS, Cards.TOMBSTONE),
+    'spell_bait': (Cards.GOBLIN_BARREL, Cards.PRINCESS, Cards.KNIGHT, Cards.ROCKET),
+    'x_bow': (Cards.X_BOW, Cards.TESLA, Cards.ARCHERS, Cards.THE_LOG),
+}
+_ARCHETYPE_CARDS: Dict[str, FrozenSet[Cards]] = {
+    archetype: frozenset(cards) for archetype, cards in _ARCHETYPE_CARDS_ORDERED.items()
+}
+_ARCHETYPE_CARD_ORDER: Dict[str, Dict[Cards, int]] = {
+    archetype: {card: index for index, card in enumerate(cards)}
+    for archetype, cards in _ARCHETYPE_CARDS_ORDERED.items()
+}
+
+# Padrões de contexto por arquétipo
+_ARCHETYPE_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    'giant_beatdown': ('behind_king_tower', 'with_support'),
+    'hog_cycle': ('bridge_spam', 'counter_attack'),
+    'golem_beatdown': ('back_of_king', 'heavy_push'),
+    'spell_bait': ('bait_spells', 'punish_spell_use'),
+}
+
+# Próxima jogada do inimigo pelo elixir estimado: bisect_left nos limites
+# (<= 2, <= 4, <= 6, < 8, >= 8). O último limite é o float anterior a 8,
+# para que exatamente 8 já conte como combo caro
+_NEXT_PLAY_THRESHOLDS = (2, 4, 6, math.nextafter(8, 0))
+_NEXT_PLAY_BY_ELIXIR = (
+    ("forced_wait", 0.8),      # Deve esperar elixir
+    ("cheap_card", 0.7),       # Carta barata
+    ("medium_card", 0.6),      # Carta média
+    ("unknown", 0.3),
+    ("expensive_combo", 0.8),  # Combo caro
+)
+
+# Oportunidade de contra-ataque (é bom momento?, confiança) pelo elixir
+# estimado: <= 3, <= 5, acima disso
+_COUNTER_ATTACK_THRESHOLDS = (3, 5)
+_COUNTER_ATTACK_BY_ELIXIR = ((True, 0.9), (True, 0.7), (False, 0.3))
+
+# Chave de ordenação das predições
+_by_confidence = attrgetter("confidence")
+
+
+def _estimate_card_cost(card: Cards) -> int:
+    """Estima custo de elixir de uma carta"""
+    return _CARD_COSTS.get(card, 4)  # Default 4
+
+
 class PredictionConfidence(Enum):
     """Níveis de confiança da predição"""
     VERY_LOW = 0.2
@@ -28,13 +154,18 @@ class PredictionConfidence(Enum):
 @dataclass
 class CardPrediction:
     """Predição de uma carta específica"""
+    # __slots__ explícito: dataclass(slots=True) exige Python 3.10 (e por
+    # isso nenhum campo tem default)
+    __slots__ = ("card", "confidence", "last_seen", "cycle_position",
+                 "expected_next_play", "play_frequency", "context_patterns")
+
     card: Cards
     confidence: float
     last_seen: float
     cycle_position: int
     expected_next_play: float
     play_frequency: float
-    context_patterns: List[str] = field(default_factory=list)
+    context_patterns: Tuple[str, ...]
 
 
 @dataclass
@@ -54,13 +185,28 @@ class EnemyCardTracker:
     def __init__(self):
         # Rastreamento básico
         self.cards_seen: Set[Cards] = set()
-        self.card_play_history: List[Tuple[Cards, float, Tuple[int, int]]] = []
+        self._seen_mask: int = 0  # Bits de _card_bit das cartas em cards_seen
+        self._seen_version: int = 0  # Incrementado quando cards_seen muda
+        self._archetype_version: int = -1
+        self._cached_archetype: str = "unknown"
+        self.card_play_history: Deque[Tuple[Cards, float, Tuple[int, int]]] = deque(
+            maxlen=HISTORY_LIMIT
+        )
         self.card_frequencies: Dict[Cards, int] = defaultdict(int)
+        # IDs das cartas jogadas, em ordem; o buffer tem o dobro do limite e
+        # é compactado quando enche (append amortizado O(1))
+        self._card_id_history = np.empty(2 * HISTORY_LIMIT, dtype=np.int16)
+        self._card_id_count: int = 0
+        # Soma e contagem dos intervalos entre jogadas consecutivas
+        self.play_interval_sum: float = 0.0
+        self.play_interval_count: int = 0
         self.card_last_seen: Dict[Cards, float] = {}
         
         # Análise de ciclo
-        self.cycle_tracking: deque = deque(maxlen=8)  # Últimas 8 cartas
+        self.cycle_tracking: deque = deque(maxlen=CYCLE_LENGTH)  # Últimas 8 cartas
         self.cycle_patterns: List[List[Cards]] = []
+        # Primeira posição de cada carta no último padrão de ciclo
+        self._last_pattern_pos: Dict[Cards, int] = {}
         self.estimated_cycle_position: int = 0
         
         # Análise contextual
@@ -69,7 +215,7 @@ class EnemyCardTracker:
         self.defensive_responses: Dict[str, List[Cards]] = defaultdict(list)
         
         # Timing e elixir
-        self.elixir_tracking: List[Tuple[float, int]] = []  # (tempo, elixir_gasto)
+        self.elixir_tracking: Deque[Tuple[float, int]] = deque(maxlen=HISTORY_LIMIT)  # (tempo, elixir_gasto)
         self.play_timing_patterns: Dict[Cards, List[float]] = defaultdict(list)
         
         # Metadados
@@ -77,15 +223,25 @@ class EnemyCardTracker:
         self.total_cards_played: int = 0
         
     def register_enemy_card(self, card: Cards, position: Tuple[int, int], 
-                          our_last_play: Optional[Cards] = None,
-                          game_context: str = "neutral"):
+                            our_last_play: Optional[Cards] = None,
+                            game_context: str = "neutral",
+                            now: Optional[float] = None):
         """Registra uma carta inimiga jogada"""
         
-        current_time = time.time()
+        current_time = time.time() if now is None else now
         
         # Rastreamento básico
-        self.cards_seen.add(card)
+        card_id = CARD_IDS[card.name]
+        card_bit = 1 << card_id
+        if not self._seen_mask & card_bit:
+            self._seen_mask |= card_bit
+            self.cards_seen.add(card)
+            self._seen_version += 1
+        if self.card_play_history:
+            self.play_interval_sum += current_time - self.card_play_history[-1][1]
+            self.play_interval_count += 1
         self.card_play_history.append((card, current_time, position))
+        self._append_card_id(card_id)
         self.card_frequencies[card] += 1
         self.card_last_seen[card] = current_time
         self.total_cards_played += 1
@@ -116,50 +272,43 @@ class EnemyCardTracker:
         estimated_cost = self._estimate_card_cost(card)
         self.elixir_tracking.append((current_time, estimated_cost))
     
+    def _append_card_id(self, card_id: int):
+        """Adiciona um ID ao histórico, descartando os mais antigos se cheio"""
+        
+        if self._card_id_count == len(self._card_id_history):
+            # Manter só os últimos HISTORY_LIMIT no início do buffer
+            self._card_id_history[:HISTORY_LIMIT] = self._card_id_history[-HISTORY_LIMIT:]
+            self._card_id_count = HISTORY_LIMIT
+        self._card_id_history[self._card_id_count] = card_id
+        self._card_id_count += 1
+    
+    @property
+    def card_id_history(self) -> np.ndarray:
+        """IDs das últimas HISTORY_LIMIT cartas jogadas, na ordem (view)"""
+        start = max(0, self._card_id_count - HISTORY_LIMIT)
+        return self._card_id_history[start:self._card_id_count]
+    
     def _analyze_cycle_patterns(self):
         """Analisa padrões de ciclo das cartas"""
         
-        if len(self.cycle_tracking) >= 8:
-            # Verificar se completou um ciclo
-            cycle_list = list(self.cycle_tracking)
-            
-            # Procurar por repetições que indicam ciclo completo
-            for i in range(1, 5):  # Verificar últimas 4 cartas
-                if len(cycle_list) >= i * 2:
-                    recent = cycle_list[-i:]
-                    previous = cycle_list[-i*2:-i]
-                    
-                    if recent == previous:
-                        # Encontrou padrão de repetição
-                        self.cycle_patterns.append(cycle_list[-8:])
-                        break
+        if len(self.cycle_tracking) >= CYCLE_LENGTH:
+            # Procurar por repetições que indicam ciclo completo: as últimas
+            # i cartas iguais às i anteriores (i de 1 a 4), sobre os IDs
+            # das mesmas cartas de cycle_tracking
+            count = self._card_id_count
+            recent_ids = self._card_id_history[count - CYCLE_LENGTH:count]
+            if cycle_repeat_window(recent_ids, _CYCLE_MAX_WINDOW) > 0:
+                # Encontrou padrão de repetição
+                pattern = list(self.cycle_tracking)
+                self.cycle_patterns.append(pattern)
+                positions = {}
+                for index, card in enumerate(pattern):
+                    positions.setdefault(card, index)  # Como list.index
+                self._last_pattern_pos = positions
     
-    def _estimate_card_cost(self, card: Cards) -> int:
-        """Estima custo de elixir de uma carta"""
-        
-        # Mapeamento básico de custos conhecidos
-        cost_mapping = {
-            # Cartas baratas (1-3)
-            'skeleton_army': 3, 'goblins': 2, 'archers': 3, 'knight': 3,
-            'ice_spirit': 1, 'skeletons': 1, 'bats': 2, 'spear_goblins': 2,
-            
-            # Cartas médias (4-5)
-            'musketeer': 4, 'minipekka': 4, 'valkyrie': 4, 'hog_rider': 4,
-            'giant': 5, 'wizard': 5, 'bomber': 3, 'cannon': 3,
-            
-            # Cartas caras (6+)
-            'pekka': 7, 'golem': 8, 'electro_giant': 8, 'mega_knight': 7,
-            'lava_hound': 7, 'balloon': 5,
-            
-            # Feitiços
-            'arrows': 3, 'fireball': 4, 'zap': 2, 'lightning': 6,
-            'rocket': 6, 'freeze': 4, 'rage': 2, 'poison': 4
-        }
-        
-        card_name = card.name.lower()
-        return cost_mapping.get(card_name, 4)  # Default 4
+    _estimate_card_cost = staticmethod(_estimate_card_cost)
     
-    def get_missing_cards_predictions(self) -> List[CardPrediction]:
+    def get_missing_cards_predictions(self, now: Optional[float] = None) -> List[CardPrediction]:
         """Prediz cartas que ainda não foram vistas"""
         
         predictions = []
@@ -167,62 +316,48 @@ class EnemyCardTracker:
         # Analisar arquétipo baseado nas cartas vistas
         archetype = self._identify_deck_archetype()
         
-        # Cartas comuns por arquétipo
-        archetype_cards = {
-            'giant_beatdown': [Cards.GIANT, Cards.MUSKETEER, Cards.BOMBER, Cards.ARROWS],
-            'hog_cycle': [Cards.HOG_RIDER, Cards.ICE_SPIRIT, Cards.CANNON, Cards.ARCHERS],
-            'golem_beatdown': [Cards.GOLEM, Cards.NIGHT_WITCH, Cards.BABY_DRAGON, Cards.LIGHTNING],
-            'pekka_bridge_spam': [Cards.PEKKA, Cards.BATTLE_RAM, Cards.BANDIT, Cards.ZAP],
-            'lava_hound': [Cards.LAVA_HOUND, Cards.BALLOON, Cards.MINIONS, Cards.TOMBSTONE],
-            'spell_bait': [Cards.GOBLIN_BARREL, Cards.PRINCESS, Cards.KNIGHT, Cards.ROCKET],
-            'x_bow': [Cards.X_BOW, Cards.TESLA, Cards.ARCHERS, Cards.THE_LOG],
-        }
-        
-        # Predizer cartas baseado no arquétipo
-        if archetype in archetype_cards:
-            for card in archetype_cards[archetype]:
-                if card not in self.cards_seen:
-                    confidence = self._calculate_prediction_confidence(card, archetype)
-                    
-                    prediction = CardPrediction(
-                        card=card,
-                        confidence=confidence,
-                        last_seen=0.0,
-                        cycle_position=self._estimate_cycle_position(card),
-                        expected_next_play=self._estimate_next_play_time(card),
-                        play_frequency=0.0,
-                        context_patterns=self._get_context_patterns(card, archetype)
-                    )
-                    predictions.append(prediction)
+        # Predizer cartas do arquétipo ainda não vistas (diferença em C),
+        # na ordem da tabela para manter a ordem dos empates
+        if archetype in _ARCHETYPE_CARDS:
+            missing = _ARCHETYPE_CARDS[archetype] - self.cards_seen
+            for card in sorted(missing, key=_ARCHETYPE_CARD_ORDER[archetype].__getitem__):
+                confidence = self._calculate_prediction_confidence(card, archetype)
+                
+                prediction = CardPrediction(
+                    card=card,
+                    confidence=confidence,
+                    last_seen=0.0,
+                    cycle_position=self._estimate_cycle_position(card),
+                    expected_next_play=self._estimate_next_play_time(card, now),
+                    play_frequency=0.0,
+                    context_patterns=self._get_context_patterns(card, archetype)
+                )
+                predictions.append(prediction)
         
-        # Ordenar por confiança
-        predictions.sort(key=lambda p: p.confidence, reverse=True)
-        return predictions[:8-len(self.cards_seen)]  # Máximo cartas faltantes
+        # Ordenar por confiança, só as k melhores (k = cartas faltantes)
+        return heapq.nlargest(8 - len(self.cards_seen), predictions, key=_by_confidence)
     
     def _identify_deck_archetype(self) -> str:
         """Identifica arquétipo do deck baseado nas cartas vistas"""
         
-        # Cartas indicadoras de arquétipos
-        archetype_indicators = {
-            'giant_beatdown': [Cards.GIANT, Cards.MUSKETEER, Cards.BOMBER],
-            'hog_cycle': [Cards.HOG_RIDER, Cards.ICE_SPIRIT, Cards.CANNON],
-            'golem_beatdown': [Cards.GOLEM, Cards.NIGHT_WITCH, Cards.BABY_DRAGON],
-            'pekka_bridge_spam': [Cards.PEKKA, Cards.BATTLE_RAM, Cards.BANDIT],
-            'lava_hound': [Cards.LAVA_HOUND, Cards.BALLOON, Cards.MINIONS],
-            'spell_bait': [Cards.GOBLIN_BARREL, Cards.PRINCESS, Cards.KNIGHT],
-            'x_bow': [Cards.X_BOW, Cards.TESLA, Cards.ARCHERS],
-        }
+        # Só muda quando uma carta nova é vista
+        if self._archetype_version == self._seen_version:
+            return self._cached_archetype
         
         best_match = "unknown"
         best_score = 0
         
-        for archetype, indicators in archetype_indicators.items():
-            score = sum(1 for card in indicators if card in self.cards_seen)
+        seen_mask = self._seen_mask
+        for archetype, indicator_mask in _INDICATOR_MASKS.items():
+            # Contagem de bits em comum (int.bit_count só existe a partir do 3.10)
+            score = bin(seen_mask & indicator_mask).count("1")
             if score > best_score:
                 best_score = score
                 best_match = archetype
         
-        return best_match if best_score >= 2 else "unknown"
+        self._cached_archetype = best_match if best_score >= 2 else "unknown"
+        self._archetype_version = self._seen_version
+        return self._cached_archetype
     
     def _calculate_prediction_confidence(self, card: Cards, archetype: str) -> float:
         """Calcula confiança da predição de uma carta"""
@@ -248,19 +383,14 @@ class EnemyCardTracker:
     def _estimate_cycle_position(self, card: Cards) -> int:
         """Estima posição da carta no ciclo"""
         
-        # Análise simplificada baseada em padrões
-        if len(self.cycle_patterns) > 0:
-            # Usar último padrão conhecido
-            last_pattern = self.cycle_patterns[-1]
-            if card in last_pattern:
-                return last_pattern.index(card)
-        
-        return -1  # Posição desconhecida
+        # Análise simplificada baseada no último padrão conhecido
+        # (-1: posição desconhecida)
+        return self._last_pattern_pos.get(card, -1)
     
-    def _estimate_next_play_time(self, card: Cards) -> float:
+    def _estimate_next_play_time(self, card: Cards, now: Optional[float] = None) -> float:
         """Estima quando a carta será jogada novamente"""
         
-        current_time = time.time()
+        current_time = time.time() if now is None else now
         
         # Se carta já foi vista, usar padrões históricos
         if card in self.card_last_seen:
@@ -278,30 +408,19 @@ class EnemyCardTracker:
         avg_cycle_time = 30.0  # 30 segundos por ciclo completo
         return current_time + avg_cycle_time
     
-    def _get_context_patterns(self, card: Cards, archetype: str) -> List[str]:
+    @staticmethod
+    def _get_context_patterns(card: Cards, archetype: str) -> Tuple[str, ...]:
         """Retorna padrões de contexto para uma carta"""
         
-        patterns = []
-        
         # Padrões baseados no arquétipo
-        archetype_patterns = {
-            'giant_beatdown': ['behind_king_tower', 'with_support'],
-            'hog_cycle': ['bridge_spam', 'counter_attack'],
-            'golem_beatdown': ['back_of_king', 'heavy_push'],
-            'spell_bait': ['bait_spells', 'punish_spell_use'],
-        }
-        
-        if archetype in archetype_patterns:
-            patterns.extend(archetype_patterns[archetype])
-        
-        return patterns
+        return _ARCHETYPE_PATTERNS.get(archetype, ())
 
 
 class EnemyElixirTracker:
     """Rastreia e prediz elixir do oponente"""
     
     def __init__(self):
-        self.enemy_elixir_history: List[Tuple[float, int]] = []
+        self.enemy_elixir_history: Deque[Tuple[float, int]] = deque(maxlen=HISTORY_LIMIT)
         self.estimated_current_elixir: int = 5  # Estimativa inicial
         self.last_update_time: float = time.time()
         self.elixir_generation_rate: float = 1.0  # 1 elixir por segundo
@@ -311,25 +430,26 @@ class EnemyElixirTracker:
         self.average_spending_per_push: float = 8.0
         
         # Detecção de vantagem/desvantagem
-        self.elixir_advantages: List[Tuple[float, int]] = []  # (tempo, vantagem)
+        self.elixir_advantages: Deque[Tuple[float, int]] = deque(maxlen=HISTORY_LIMIT)  # (tempo, vantagem)
     
     def update_enemy_elixir(self, cards_played: List[Cards], 
-                          context: str = "neutral"):
+                            context: str = "neutral",
+                            now: Optional[float] = None):
         """Atualiza estimativa de elixir inimigo baseado nas cartas jogadas"""
         
-        current_time = time.time()
+        current_time = time.time() if now is None else now
         time_diff = current_time - self.last_update_time
         
-        # Regeneração natural de elixir
+        # Regeneração natural de elixir (limitada a 10)
         elixir_generated = min(10, time_diff * self.elixir_generation_rate)
-        self.estimated_current_elixir = min(10, self.estimated_current_elixir + elixir_generated)
+        elixir = min(10, self.estimated_current_elixir + elixir_generated)
         
-        # Subtrair elixir gasto
-        total_spent = 0
-        for card in cards_played:
-            cost = self._estimate_card_cost(card)
-            total_spent += cost
-            self.estimated_current_elixir = max(0, self.estimated_current_elixir - cost)
+        # Subtrair elixir gasto de uma vez: como os custos são positivos,
+        # limitar a 0 só no fim dá o mesmo que limitar a cada carta
+        total_spent = sum(map(self._estimate_card_cost, cards_played))
+        if total_spent:
+            elixir = max(0, elixir - total_spent)
+        self.estimated_current_elixir = elixir
         
         # Registrar padrão de gasto
         if total_spent > 0:
@@ -338,15 +458,10 @@ class EnemyElixirTracker:
         
         self.last_update_time = current_time
     
-    def _estimate_card_cost(self, card: Cards) -> int:
-        """Estima custo de elixir (mesmo método do tracker)"""
-        cost_mapping = {
-            'skeleton_army': 3, 'goblins': 2, 'archers': 3, 'knight': 3,
-            'musketeer': 4, 'minipekka': 4, 'valkyrie': 4, 'hog_rider': 4,
-            'giant': 5, 'wizard': 5, 'pekka': 7, 'golem': 8,
-            'arrows': 3, 'fireball': 4, 'zap': 2, 'lightning': 6,
-        }
-        return cost_mapping.get(card.name.lower(), 4)
+    @staticmethod
+    def _estimate_card_cost(card: Cards) -> int:
+        """Estima custo de elixir (tabela própria, menor que a do tracker)"""
+        return _ELIXIR_TRACKER_COSTS.get(card, 4)
     
     def get_elixir_advantage(self, our_elixir: int) -> int:
         """Calcula vantagem/desvantagem de elixir"""
@@ -362,41 +477,31 @@ class EnemyElixirTracker:
     def predict_enemy_next_play(self) -> Tuple[str, float]:
         """Prediz próxima jogada do inimigo baseada no elixir"""
         
-        if self.estimated_current_elixir <= 2:
-            return ("forced_wait", 0.8)  # Deve esperar elixir
-        elif self.estimated_current_elixir <= 4:
-            return ("cheap_card", 0.7)   # Carta barata
-        elif self.estimated_current_elixir <= 6:
-            return ("medium_card", 0.6)  # Carta média
-        elif self.estimated_current_elixir >= 8:
-            return ("expensive_combo", 0.8)  # Combo caro
-        else:
-            return ("unknown", 0.3)
+        return _NEXT_PLAY_BY_ELIXIR[
+            bisect_left(_NEXT_PLAY_THRESHOLDS, self.estimated_current_elixir)
+        ]
     
     def is_good_counter_attack_moment(self) -> Tuple[bool, float]:
         """Determina se é bom momento para contra-ataque"""
         
         # Bom momento se inimigo tem pouco elixir
-        if self.estimated_current_elixir <= 3:
-            confidence = 0.9
-        elif self.estimated_current_elixir <= 5:
-            confidence = 0.7
-        else:
-            confidence = 0.3
-        
-        return (self.estimated_current_elixir <= 5, confidence)
+        return _COUNTER_ATTACK_BY_ELIXIR[
+            bisect_left(_COUNTER_ATTACK_THRESHOLDS, self.estimated_current_elixir)
+        ]
 
 
 class AdvancedEnemyPredictor:
     """Sistema principal de predição avançada"""
     
     def __init__(self):
+        warm_up_kernels()  # JIT fora do caminho das jogadas
         self.card_tracker = EnemyCardTracker()
         self.elixir_tracker = EnemyElixirTracker()
         
         # Predições consolidadas
         self.current_deck_prediction: Optional[DeckPrediction] = None
         self.next_card_predictions: List[CardPrediction] = []
+        self._top_next_predictions: List[CardPrediction] = []  # As 3 primeiras
         
         # Análise de padrões
         self.behavioral_patterns: Dict[str, float] = {}
@@ -418,10 +523,10 @@ class AdvancedEnemyPredictor:
                 )
             return
         
-        # É uma lista de tuples
+        # É uma lista de tuples (um único relógio para todo o lote)
+        current_time = time.time()
         for card, position, time_since_play in recent_enemy_plays:
             # Converter tempo relativo para timestamp absoluto
-            current_time = time.time()
             play_time = current_time - time_since_play
             
             # Processar a jogada
@@ -430,7 +535,8 @@ class AdvancedEnemyPredictor:
                 position=position,
                 our_last_play=None,  # Não temos contexto do nosso último play aqui
                 our_elixir=5,  # Placeholder
-                game_context="neutral"
+                game_context="neutral",
+                now=current_time
                          )
     
     def get_known_enemy_cards(self) -> List[Cards]:
@@ -438,28 +544,35 @@ class AdvancedEnemyPredictor:
         return list(self.card_tracker.cards_seen)
      
     def process_enemy_play(self, card: Cards, position: Tuple[int, int],
-                         our_last_play: Optional[Cards] = None,
-                         our_elixir: int = 5,
-                         game_context: str = "neutral"):
-        """Processa uma jogada inimiga e atualiza predições"""
+                           our_last_play: Optional[Cards] = None,
+                           our_elixir: int = 5,
+                           game_context: str = "neutral",
+                           now: Optional[float] = None):
+        """
+        Processa uma jogada inimiga e atualiza predições.
+        `now` (time.time()) é lido uma vez e usado por todas as etapas.
+        """
+        
+        if now is None:
+            now = time.time()
         
         # Atualizar trackers
-        self.card_tracker.register_enemy_card(card, position, our_last_play, game_context)
-        self.elixir_tracker.update_enemy_elixir([card], game_context)
+        self.card_tracker.register_enemy_card(card, position, our_last_play, game_context, now=now)
+        self.elixir_tracker.update_enemy_elixir([card], game_context, now=now)
         
         # Atualizar predições
-        self._update_deck_prediction()
-        self._update_next_card_predictions()
+        self._update_deck_prediction(now)
+        self._update_next_card_predictions(now)
         self._analyze_behavioral_patterns()
     
-    def _update_deck_prediction(self):
+    def _update_deck_prediction(self, now: Optional[float] = None):
         """Atualiza predição completa do deck"""
         
         confirmed_cards = self.card_tracker.cards_seen
         predicted_cards = {}
         
         # Obter predições de cartas faltantes
-        missing_predictions = self.card_tracker.get_missing_cards_predictions()
+        missing_predictions = self.card_tracker.get_missing_cards_predictions(now)
         for pred in missing_predictions:
             predicted_cards[pred.card] = pred.confidence
         
@@ -471,7 +584,7 @@ class AdvancedEnemyPredictor:
         confidence = cards_seen_ratio * 0.7 + (0.3 if archetype != "unknown" else 0.0)
         
         # Calcular elixir médio
-        total_cost = sum(self.card_tracker._estimate_card_cost(card) for card in confirmed_cards)
+        total_cost = sum(map(_estimate_card_cost, confirmed_cards))
         avg_elixir = total_cost / len(confirmed_cards) if confirmed_cards else 4.0
         
         self.current_deck_prediction = DeckPrediction(
@@ -483,7 +596,7 @@ class AdvancedEnemyPredictor:
             average_elixir=avg_elixir
         )
     
-    def _update_next_card_predictions(self):
+    def _update_next_card_predictions(self, now: Optional[float] = None):
         """Atualiza predições da próxima carta"""
         
         self.next_card_predictions = []
@@ -495,22 +608,25 @@ class AdvancedEnemyPredictor:
             # Predizer próximas cartas do ciclo
             for card in self.card_tracker.cards_seen:
                 if card not in recent_cards[-4:]:  # Não jogada recentemente
-                    confidence = self._calculate_next_play_confidence(card)
+                    confidence = self._calculate_next_play_confidence(card, now)
                     
                     prediction = CardPrediction(
                         card=card,
                         confidence=confidence,
                         last_seen=self.card_tracker.card_last_seen.get(card, 0),
                         cycle_position=self.card_tracker._estimate_cycle_position(card),
-                        expected_next_play=self.card_tracker._estimate_next_play_time(card),
-                        play_frequency=self.card_tracker.card_frequencies[card]
+                        expected_next_play=self.card_tracker._estimate_next_play_time(card, now),
+                        play_frequency=self.card_tracker.card_frequencies[card],
+                        context_patterns=()
                     )
                     self.next_card_predictions.append(prediction)
         
         # Ordenar por probabilidade
-        self.next_card_predictions.sort(key=lambda p: p.confidence, reverse=True)
+        self.next_card_predictions.sort(key=_by_confidence, reverse=True)
+        # Recomendações e resumo só leem as 3 primeiras: fatiar uma vez aqui
+        self._top_next_predictions = self.next_card_predictions[:3]
     
-    def _calculate_next_play_confidence(self, card: Cards) -> float:
+    def _calculate_next_play_confidence(self, card: Cards, now: Optional[float] = None) -> float:
         """Calcula confiança de que uma carta será jogada em breve"""
         
         base_confidence = 0.3
@@ -525,12 +641,13 @@ class AdvancedEnemyPredictor:
         
         # Boost baseado no tempo desde última jogada
         if card in self.card_tracker.card_last_seen:
-            time_since_last = time.time() - self.card_tracker.card_last_seen[card]
+            current_time = time.time() if now is None else now
+            time_since_last = current_time - self.card_tracker.card_last_seen[card]
             if time_since_last > 20:  # Não jogada há 20+ segundos
                 base_confidence += 0.3
         
         # Boost baseado no elixir disponível
-        card_cost = self.card_tracker._estimate_card_cost(card)
+        card_cost = _estimate_card_cost(card)
         if self.elixir_tracker.estimated_current_elixir >= card_cost:
             base_confidence += 0.2
         
@@ -540,21 +657,17 @@ class AdvancedEnemyPredictor:
         """Analisa padrões comportamentais do oponente"""
         
         # Agressividade
-        aggressive_plays = len([p for p in self.card_tracker.context_plays["attack"]])
+        # .get para não criar a chave "attack" vazia no defaultdict
+        aggressive_plays = len(self.card_tracker.context_plays.get("attack", ()))
         total_plays = self.card_tracker.total_cards_played
         
         if total_plays > 0:
             self.behavioral_patterns["aggressiveness"] = aggressive_plays / total_plays
         
         # Paciência (tempo entre jogadas)
-        if len(self.card_tracker.card_play_history) >= 2:
-            time_intervals = []
-            for i in range(1, len(self.card_tracker.card_play_history)):
-                prev_time = self.card_tracker.card_play_history[i-1][1]
-                curr_time = self.card_tracker.card_play_history[i][1]
-                time_intervals.append(curr_time - prev_time)
-            
-            avg_interval = sum(time_intervals) / len(time_intervals)
+        tracker = self.card_tracker
+        if tracker.play_interval_count > 0:
+            avg_interval = tracker.play_interval_sum / tracker.play_interval_count
             self.behavioral_patterns["patience"] = min(1.0, avg_interval / 10.0)
         
         # Adaptação (mudança de padrões)
@@ -563,26 +676,14 @@ class AdvancedEnemyPredictor:
     def _calculate_adaptation_level(self) -> float:
         """Calcula nível de adaptação do oponente"""
         
-        if len(self.card_tracker.card_play_history) < 10:
+        history = self.card_tracker.card_id_history
+        if len(history) < 10:
             return 0.0
         
-        # Comparar padrões da primeira e segunda metade do jogo
-        mid_point = len(self.card_tracker.card_play_history) // 2
-        first_half = self.card_tracker.card_play_history[:mid_point]
-        second_half = self.card_tracker.card_play_history[mid_point:]
-        
-        # Calcular diferença nos padrões de cartas
-        first_cards = set(play[0] for play in first_half)
-        second_cards = set(play[0] for play in second_half)
-        
-        overlap = len(first_cards.intersection(second_cards))
-        total_unique = len(first_cards.union(second_cards))
-        
-        if total_unique > 0:
-            similarity = overlap / total_unique
-            return 1.0 - similarity  # Menos similaridade = mais adaptação
-        
-        return 0.0
+        # Comparar padrões da primeira e segunda metade do jogo: menos
+        # cartas em comum entre as metades = mais adaptação
+        mid_point = len(history) // 2
+        return float(card_set_distance(history, mid_point, _CARD_ID_COUNT))
     
     def get_counter_strategy_recommendations(self) -> Dict[str, any]:
         """Retorna recomendações de contra-estratégia"""
@@ -596,7 +697,7 @@ class AdvancedEnemyPredictor:
         }
         
         # Ameaças imediatas baseadas em predições
-        for pred in self.next_card_predictions[:3]:
+        for pred in self._top_next_predictions:
             if pred.confidence > 0.7:
                 recommendations["immediate_threats"].append({
                     "card": pred.card.name,
@@ -652,7 +753,7 @@ class AdvancedEnemyPredictor:
                     "confidence": pred.confidence,
                     "expected_time": pred.expected_next_play
                 }
-                for pred in self.next_card_predictions[:3]
+                for pred in self._top_next_predictions
             ],
             "elixir_tracking": {
                 "estimated_enemy_elixir": self.elixir_tracker.estimated_current_elixir,
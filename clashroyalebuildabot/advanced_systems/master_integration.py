@@ -25,6 +25,10 @@ from .intelligent_positioning import IntelligentPositioning, PositionType, UnitI
 from .phase_control import PhaseController, GamePhase
 
 
+# HP das torres inimigas enquanto não há detecção (rei, esquerda, direita)
+_ENEMY_TOWER_HP_PLACEHOLDER = (100, 100, 100)
+
+
 @dataclass
 class GameState:
     """Estado completo do jogo"""
@@ -116,6 +120,8 @@ class MasterBotController:
                          recent_our_plays: List[Tuple[Cards, Tuple[int, int], float]]):
         """Atualiza estado completo do jogo em todos os subsistemas"""
         
+        now = time.time()
+        
         # Atualizar controlador de fases
         self.phase_controller.update_game_state(
             game_time, tower_hp, 
@@ -132,9 +138,10 @@ class MasterBotController:
             our_elixir=our_elixir,
             enemy_elixir=self.elixir_controller.enemy_current_elixir,
             our_tower_hp=[tower_hp.get('king', 100), tower_hp.get('left', 100), tower_hp.get('right', 100)],
-            enemy_tower_hp=[100, 100, 100],  # Placeholder - implementar detecção
+            enemy_tower_hp=_ENEMY_TOWER_HP_PLACEHOLDER,  # Placeholder - implementar detecção
             recent_enemy_plays=[play[0] if isinstance(play, tuple) else play for play in recent_enemy_plays],
-            elixir_advantage=our_elixir - self.elixir_controller.enemy_current_elixir
+            elixir_advantage=our_elixir - self.elixir_controller.enemy_current_elixir,
+            now=now
         )
         
         # Atualizar sistema de defesa
@@ -24,6 +24,10 @@ class GamePhase(Enum):
     SUDDEN_DEATH = "sudden_death"     # Overtime avançado
 
 
+# Fases finais da partida (comparadas por identidade dos membros)
+LATE_PHASES = frozenset({GamePhase.LATE_GAME, GamePhase.OVERTIME})
+
+
 class PhaseStrategy(Enum):
     """Estratégias por fase"""
     CONSERVATIVE = "conservative"     # Jogo conservador
@@ -264,7 +268,7 @@ class PhaseController:
             self.tower_states["enemy_right"]
         ])
         
-        if min_tower_hp < 500 and base_phase == GamePhase.MID_GAME:
+        if min_tower_hp < 500 and base_phase is GamePhase.MID_GAME:
             return GamePhase.LATE_GAME
         elif min_tower_hp < 200:
             return GamePhase.OVERTIME
@@ -274,7 +278,7 @@ class PhaseController:
             recent_advantages = [adv for _, adv in self.elixir_trends[-5:]]
             avg_advantage = sum(recent_advantages) / len(recent_advantages)
             
-            if avg_advantage < -3 and base_phase in [GamePhase.LATE_GAME, GamePhase.OVERTIME]:
+            if avg_advantage < -3 and base_phase in LATE_PHASES:
                 # Manter fase atual mas ajustar estratégia
                 pass
         
@@ -474,7 +478,7 @@ class PhaseController:
         }
         
         # Conselhos táticos baseados na fase
-        if self.current_phase == GamePhase.EARLY_GAME:
+        if self.current_phase is GamePhase.EARLY_GAME:
             recommendations["tactical_advice"] = [
                 "Focus on elixir advantage and cycle control",
                 "Avoid expensive commitments",
@@ -482,7 +486,7 @@ class PhaseController:
                 "Learn opponent's deck"
             ]
         
-        elif self.current_phase == GamePhase.MID_GAME:
+        elif self.current_phase is GamePhase.MID_GAME:
             recommendations["tactical_advice"] = [
                 "Start applying pressure with combos",
                 "Look for tower damage opportunities",
@@ -490,7 +494,7 @@ class PhaseController:
                 "Adapt to opponent's strategy"
             ]
         
-        elif self.current_phase == GamePhase.LATE_GAME:
+        elif self.current_phase is GamePhase.LATE_GAME:
             recommendations["tactical_advice"] = [
                 "Prioritize tower damage",
                 "Use spells for guaranteed damage",
@@ -498,7 +502,7 @@ class PhaseController:
                 "Prepare for overtime"
             ]
         
-        elif self.current_phase == GamePhase.OVERTIME:
+        elif self.current_phase is GamePhase.OVERTIME:
             recommendations["tactical_advice"] = [
                 "Maximum aggression - go for the win",
                 "Cycle spells for tower damage",
@@ -598,11 +602,11 @@ class PhaseController:
             GamePhase.OVERTIME: float('inf')  # Sem limite
         }
         
-        if self.current_phase == GamePhase.EARLY_GAME:
+        if self.current_phase is GamePhase.EARLY_GAME:
             return max(0, 60 - game_time)
-        elif self.current_phase == GamePhase.MID_GAME:
+        elif self.current_phase is GamePhase.MID_GAME:
             return max(0, 180 - game_time)
-        elif self.current_phase == GamePhase.LATE_GAME:
+        elif self.current_phase is GamePhase.LATE_GAME:
             return max(0, 300 - game_time)
         else:  # OVERTIME
             return float('inf')
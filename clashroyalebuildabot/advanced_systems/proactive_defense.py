@@ -15,6 +15,16 @@ import math
 from clashroyalebuildabot.namespaces.cards import Cards
 
 
+# Custo de elixir das cartas usadas como contador
+_CARD_COSTS: Dict[Cards, int] = {
+    Cards.SKELETON_ARMY: 3, Cards.GOBLINS: 2, Cards.ARCHERS: 3, Cards.KNIGHT: 3,
+    Cards.MUSKETEER: 4, Cards.MINIPEKKA: 4, Cards.VALKYRIE: 4, Cards.HOG_RIDER: 4,
+    Cards.GIANT: 5, Cards.WIZARD: 5, Cards.PEKKA: 7, Cards.GOLEM: 8,
+    Cards.ARROWS: 3, Cards.FIREBALL: 4, Cards.ZAP: 2, Cards.LIGHTNING: 6,
+    Cards.CANNON: 3, Cards.TESLA: 4, Cards.INFERNO_TOWER: 5, Cards.TOMBSTONE: 3
+}
+
+
 class ThreatLevel(Enum):
     """Níveis de ameaça"""
     MINIMAL = 1
@@ -554,16 +564,10 @@ class ProactiveDefenseManager:
         
         return backup_options
     
-    def _estimate_card_cost(self, card: Cards) -> int:
+    @staticmethod
+    def _estimate_card_cost(card: Cards) -> int:
         """Estima custo de elixir de uma carta"""
-        cost_mapping = {
-            'skeleton_army': 3, 'goblins': 2, 'archers': 3, 'knight': 3,
-            'musketeer': 4, 'minipekka': 4, 'valkyrie': 4, 'hog_rider': 4,
-            'giant': 5, 'wizard': 5, 'pekka': 7, 'golem': 8,
-            'arrows': 3, 'fireball': 4, 'zap': 2, 'lightning': 6,
-            'cannon': 3, 'tesla': 4, 'inferno_tower': 5, 'tombstone': 3
-        }
-        return cost_mapping.get(card.name.lower(), 4)
+        return _CARD_COSTS.get(card, 4)  # Default 4
     
     def should_execute_defense_now(self, preparation: DefensePreparation) -> bool:
         """Determina se deve executar defesa agora"""
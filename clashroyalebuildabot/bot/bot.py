@@ -22,6 +22,7 @@ from clashroyalebuildabot.constants import TILE_WIDTH
 from clashroyalebuildabot.detectors import Detector
 from clashroyalebuildabot.emulator import Emulator
 from clashroyalebuildabot.namespaces import Screens
+from clashroyalebuildabot.namespaces.state import StateSnapshot
 from clashroyalebuildabot.visualizer import Visualizer
 from clashroyalebuildabot.utils.health_monitor import HealthMonitor
 from error_handling import WikifiedError
@@ -159,6 +160,8 @@ class Bot:
             screenshot = self.emulator.take_screenshot()
             self.state = self.detector.run(screenshot)
             self.visualizer.run(screenshot, self.state)
+            # Dados compartilhados pelas ações, calculados uma vez por tick
+            self.state.snapshot = StateSnapshot.from_state(self.state)
         except Exception as e:
             logger.error(f"Erro ao definir estado: {str(e)}")
             import traceback
@@ -5,6 +5,7 @@ Enhanced Bot with Intelligent Systems
 Bot aprimorado com sistemas inteligentes de decisão, combos, defesa e otimização.
 """
 
+import re
 import time
 import random
 from typing import List, Optional, Tuple, Dict, Any
@@ -35,7 +36,7 @@ from ..core.card_roles import DeckAnalyzer, CardRoleDatabase
 from ..core.game_state import GameStateAnalyzer, GameStateInfo
 from ..core.combo_system import ComboManager
 from ..core.defense_system import DefenseManager
-from ..core.enhanced_action import EnhancedAction
+from ..core.enhanced_action import EnhancedAction, StrategicContext
 from ..core.memory_system import MemorySystem
 from ..core.elixir_optimizer import ElixirOptimizer
 
@@ -49,6 +50,23 @@ except ImportError:
     ENHANCED_ACTIONS_AVAILABLE = False
     print("⚠️  Ações aprimoradas não disponíveis, usando ações padrão")
 
+# Categorias de cartas, compiladas uma vez (busca por substring no nome)
+_DEFENSE_CARD_RE = re.compile(
+    "cannon|tesla|inferno_tower|bomb_tower|knight|valkyrie|mini_pekka|pekka"
+)
+_ATTACK_CARD_RE = re.compile(
+    "giant|golem|pekka|hog_rider|balloon|musketeer|wizard|archers"
+)
+
+# Custos estimados por nome de carta - pode ser expandido
+_CARD_COSTS: Dict[str, int] = {
+    'giant': 5, 'golem': 8, 'pekka': 7, 'mega_knight': 7,
+    'hog_rider': 4, 'ram_rider': 5, 'balloon': 5,
+    'musketeer': 4, 'wizard': 5, 'archers': 3,
+    'knight': 3, 'valkyrie': 4, 'mini_pekka': 4,
+    'skeletons': 1, 'goblins': 2, 'spear_goblins': 2
+}
+
 
 class EnhancedBot(Bot):
     """Bot aprimorado com inteligência estratégica e sistemas avançados"""
@@ -110,7 +128,18 @@ class EnhancedBot(Bot):
         # Inicializar sistemas básicos
         self.deck_analyzer = DeckAnalyzer(deck_cards)
         self.game_state_analyzer = GameStateAnalyzer(self.deck_analyzer)
+        
+        # Termos de score constantes na partida, calculados uma vez
+        if ENHANCED_ACTIONS_AVAILABLE:
+            for enhanced_class in (EnhancedGiantAction, EnhancedMusketeerAction,
+                                   EnhancedHogRiderAction):
+                enhanced_class.compile_specialized(self.deck_analyzer.strategy)
         self.combo_manager = ComboManager(deck_cards)
+        
+        # Contexto único, herdado por cada ação aprimorada criada
+        EnhancedAction.set_shared_context(StrategicContext(
+            self.deck_analyzer, self.game_state_analyzer, self.combo_manager
+        ))
         self.defense_manager = DefenseManager(deck_cards)
         self.memory_system = MemorySystem()
         self.elixir_optimizer = ElixirOptimizer()
@@ -173,20 +202,13 @@ class EnhancedBot(Bot):
             if card_found:
                 # Criar ação aprimorada
                 enhanced_class = enhanced_action_map[card_found]
+                # (o contexto estratégico vem do StrategicContext compartilhado)
                 enhanced_action = enhanced_class(
                     index=action.index,
                     tile_x=action.tile_x,
                     tile_y=action.tile_y
                 )
                 
-                # Configurar contexto estratégico
-                if hasattr(enhanced_action, 'set_strategic_context'):
-                    enhanced_action.set_strategic_context(
-                        self.deck_analyzer,
-                        self.game_state_analyzer,
-                        self.combo_manager
-                    )
-                
                 enhanced_actions.append(enhanced_action)
                 print(f"🔧 Ação aprimorada criada: {card_found.name}")
             else:
@@ -329,19 +351,10 @@ class EnhancedBot(Bot):
         else:
             return "counter"
     
-    def _estimate_card_cost(self, card_name: str) -> int:
+    @staticmethod
+    def _estimate_card_cost(card_name: str) -> int:
         """Estima o custo de elixir de uma carta"""
-        
-        # Mapeamento simplificado - pode ser expandido
-        cost_map = {
-            'giant': 5, 'golem': 8, 'pekka': 7, 'mega_knight': 7,
-            'hog_rider': 4, 'ram_rider': 5, 'balloon': 5,
-            'musketeer': 4, 'wizard': 5, 'archers': 3,
-            'knight': 3, 'valkyrie': 4, 'mini_pekka': 4,
-            'skeletons': 1, 'goblins': 2, 'spear_goblins': 2
-        }
-        
-        return cost_map.get(card_name.lower(), 4)
+        return _CARD_COSTS.get(card_name.lower(), 4)  # Default 4
     
     def _log_elixir_analysis(self, analysis):
         """Log da análise de elixir"""
@@ -544,22 +557,12 @@ class EnhancedBot(Bot):
     def _is_defense_card(self, card: Cards) -> bool:
         """Verifica se é uma carta defensiva"""
         
-        defense_cards = [
-            'cannon', 'tesla', 'inferno_tower', 'bomb_tower',
-            'knight', 'valkyrie', 'mini_pekka', 'pekka'
-        ]
-        
-        return any(defense in card.name.lower() for defense in defense_cards)
+        return _DEFENSE_CARD_RE.search(card.name.lower()) is not None
     
     def _is_attack_card(self, card: Cards) -> bool:
         """Verifica se é uma carta de ataque"""
         
-        attack_cards = [
-            'giant', 'golem', 'pekka', 'hog_rider', 'balloon',
-            'musketeer', 'wizard', 'archers'
-        ]
-        
-        return any(attack in card.name.lower() for attack in attack_cards)
+        return _ATTACK_CARD_RE.search(card.name.lower()) is not None
     
     def _execute_card_action(self, card: Cards, position: tuple) -> tuple:
         """Executa ação de uma carta específica"""
@@ -608,13 +611,13 @@ class EnhancedBot(Bot):
         gs = self.last_game_state
         
         print(f"📊 Estado do jogo:")
-        print(f"   Fase: {gs.phase.value} | Modo: {gs.game_mode}")
+        print(f"   Fase: {gs.phase.label} | Modo: {gs.game_mode.label}")
         print(f"   Elixir: {gs.our_elixir} | Déficit inimigo: {gs.enemy_elixir_deficit}")
         print(f"   Ameaças: {len(gs.threats)} | Oportunidades: {len(gs.opportunities)}")
         print(f"   Estratégia: {gs.recommended_strategy}")
         
         if gs.threats:
-            primary_threat = gs.get_primary_threat()
+            primary_threat = gs.primary_threat
             print(f"   🚨 Ameaça principal: {primary_threat.card_name} "
                   f"(nível {primary_threat.threat_level.value})")
         
@@ -649,8 +652,8 @@ class EnhancedBot(Bot):
         
         if self.last_game_state:
             stats.update({
-                'current_phase': self.last_game_state.phase.value,
-                'current_mode': self.last_game_state.game_mode,
+                'current_phase': self.last_game_state.phase.label,
+                'current_mode': self.last_game_state.game_mode.label,
                 'active_threats': len(self.last_game_state.threats),
                 'active_opportunities': len(self.last_game_state.opportunities),
             })
@@ -900,6 +903,10 @@ class EnhancedBot(Bot):
             # Usar lógica original se inteligência estiver desabilitada
             return super()._handle_game_step()
         
+        # Novo tick: a análise do estado anterior não vale mais
+        if self.game_state_analyzer:
+            self.game_state_analyzer.new_frame()
+        
         try:
             # PRIORIDADE 1: Sistemas Avançados (se habilitados)
             if self.advanced_systems_enabled:
@@ -0,0 +1,360 @@
+"""
+Kernels numéricos dos scores básicos das ações aprimoradas.
+
+Quando o numba está instalado (extra "jit"), os kernels são compilados
+com @njit e o resultado fica em cache no disco. Sem numba, as mesmas
+funções rodam em Python puro, e os laços sobre inimigos que pesam mais
+são trocados por versões vetorizadas com NumPy.
+
+warm_up_kernels() compila os kernels de timing, elixir e predição do
+inimigo na criação dos gerenciadores, e não no primeiro tick da partida.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Substituto sem numba: retorna a função sem compilar"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+def _giant_basic_score_py(enemy_x, enemy_y, elixir):
+    """Score básico do Gigante e lado preferido (-1 esquerda, 1 direita)"""
+    score = 0.5 if elixir >= 8 else 0.2
+    left_enemies = 0
+    right_enemies = 0
+
+    for i in range(enemy_x.shape[0]):
+        dx = enemy_x[i] - 9
+        dy = enemy_y[i] - 14
+        d2 = dx * dx + dy * dy
+        if d2 >= 64:  # Inimigo longe das torres
+            score += 0.3
+        elif d2 <= 16:  # Inimigo perto, não é bom momento
+            score -= 0.2
+
+        if enemy_x[i] <= 9:
+            left_enemies += 1
+        else:
+            right_enemies += 1
+
+    position = 0.0
+    if left_enemies < right_enemies:
+        position = -1.0  # Preferir esquerda
+    elif right_enemies < left_enemies:
+        position = 1.0  # Preferir direita
+
+    return max(0.0, score), position
+
+
+def _giant_basic_score_numpy(enemy_x, enemy_y, elixir):
+    """Mesmo cálculo de _giant_basic_score_py, vetorizado para Python puro"""
+    dx = enemy_x - 9
+    dy = enemy_y - 14
+    d2 = dx * dx + dy * dy
+    far = int(np.count_nonzero(d2 >= 64))
+    near = int(np.count_nonzero(d2 <= 16))
+    score = (0.5 if elixir >= 8 else 0.2) + 0.3 * far - 0.2 * near
+
+    left_enemies = int(np.count_nonzero(enemy_x <= 9))
+    right_enemies = enemy_x.shape[0] - left_enemies
+
+    position = 0.0
+    if left_enemies < right_enemies:
+        position = -1.0  # Preferir esquerda
+    elif right_enemies < left_enemies:
+        position = 1.0  # Preferir direita
+
+    return max(0.0, score), position
+
+
+# Com numba o laço é compilado; sem ele, a versão vetorizada é mais rápida
+giant_basic_score = (
+    njit(cache=True)(_giant_basic_score_py)
+    if NUMBA_AVAILABLE
+    else _giant_basic_score_numpy
+)
+
+
+@njit(cache=True)
+def hog_basic_score(enemy_y, elixir):
+    """Score básico do Corredor, já limitado ao intervalo [0, 1]"""
+    score = 0.3
+    if elixir >= 6:
+        score += 0.3
+    elif elixir >= 8:
+        score += 0.5
+
+    # Simplificado: inimigos perto das torres são construções
+    building_enemies = 0
+    troop_enemies = 0
+    for i in range(enemy_y.shape[0]):
+        if enemy_y[i] >= 12:
+            building_enemies += 1
+        else:
+            troop_enemies += 1
+
+    # Penalizar se há muitas defesas
+    if building_enemies >= 2:
+        score *= 0.5
+    elif building_enemies == 1:
+        score *= 0.7
+
+    # Boost se há poucas tropas inimigas
+    if troop_enemies == 0:
+        score += 0.4
+    elif troop_enemies == 1:
+        score += 0.2
+
+    return max(0.0, min(1.0, score))
+
+
+@njit(cache=True)
+def _musketeer_position(levels, threat_x, air_mask, has_active_combo):
+    """
+    Lado da Mosqueteira (-1 esquerda, 1 direita, 0 indiferente): oposto à
+    primeira ameaça aérea, livre se há combo ativo, senão flanqueando a
+    primeira ameaça terrestre de nível médio ou maior.
+    """
+    air_index = -1
+    ground_index = -1
+    for i in range(levels.shape[0]):
+        if air_index < 0 and air_mask[i]:
+            air_index = i
+        if ground_index < 0 and levels[i] >= 2:
+            ground_index = i
+    if air_index >= 0:
+        return -1.0 if threat_x[air_index] <= 9 else 1.0
+    if has_active_combo:
+        return 0.0  # Posição será determinada pelo combo
+    if ground_index >= 0:
+        return 1.0 if threat_x[ground_index] <= 9 else -1.0
+    return 0.0
+
+
+@njit(cache=True)
+def musketeer_scores(
+    levels,
+    threat_x,
+    air_defense_mask,
+    air_mask,
+    primary_medium_hp,
+    should_defend,
+    should_attack,
+    enemy_elixir_deficit,
+    early_phase,
+    mid_late_phase,
+    has_active_combo,
+):
+    """
+    Fatores do score inteligente da Mosqueteira a partir das ameaças em
+    arrays (mesma ordem de GameStateInfo.threats).
+    Retorna (papel, defesa aérea, tático, posição).
+    """
+    count = levels.shape[0]
+
+    # Papel atual: defesa contra a ameaça principal ou suporte ao push
+    role_score = 0.4
+    if should_defend:
+        if count > 0:
+            # Excelente contra tropas de médio HP
+            if primary_medium_hp:
+                role_score += 0.5
+            # Boa contra ameaças de nível médio (ThreatLevel.MEDIUM)
+            if levels[0] == 2:
+                role_score += 0.3
+    elif should_attack:
+        role_score += 0.4
+    if role_score > 1.0:
+        role_score = 1.0
+
+    # Defesa aérea: 1.2 se alguma ameaça aérea é crítica
+    air_score = 0.3
+    for i in range(count):
+        if air_defense_mask[i]:
+            if levels[i] >= 3:
+                air_score = 1.2
+                break
+            air_score = 0.8
+
+    # Tático: muitas ameaças, vantagem de elixir e fase do jogo
+    if count >= 3:
+        tactical_score = 0.7
+    elif enemy_elixir_deficit >= 2:
+        tactical_score = 1.2
+    elif early_phase:
+        tactical_score = 0.9
+    elif mid_late_phase:
+        tactical_score = 1.1
+    else:
+        tactical_score = 1.0
+
+    # Posição: interceptar ameaça aérea, seguir combo ou flanquear
+    position = _musketeer_position(
+        levels, threat_x, air_mask, has_active_combo
+    )
+
+    return role_score, air_score, tactical_score, position
+
+
+@njit(cache=True)
+def elixir_horizon_predictions(
+    our_elixir,
+    enemy_elixir,
+    generation_rate,
+    horizons,
+    our_planned_spend,
+    enemy_spend_rate,
+):
+    """
+    Elixir previsto (nosso e inimigo) para cada horizonte em segundos.
+    Os gastos são subtraídos depois do limite de 10 e o resultado é
+    truncado para inteiro, como nas predições originais.
+    """
+    count = horizons.shape[0]
+    our = np.empty(count, dtype=np.int64)
+    enemy = np.empty(count, dtype=np.int64)
+
+    for i in range(count):
+        regen = horizons[i] * generation_rate
+
+        # Nosso elixir: regeneração menos gastos planejados da estratégia
+        predicted = min(10.0, our_elixir + regen) - our_planned_spend
+        our[i] = int(max(0.0, predicted))
+
+        # Inimigo: regeneração menos a média recente de gastos
+        predicted = min(10.0, enemy_elixir + regen) - enemy_spend_rate * (
+            horizons[i] / 10.0
+        )
+        enemy[i] = int(max(0.0, predicted))
+
+    return our, enemy
+
+
+@njit(cache=True)
+def combo_timing_kernel(modifiers, base_delay, context_mask):
+    """
+    Delay ajustado de um combo para os contextos ligados em context_mask
+    (bit i = coluna i de modifiers).
+    """
+    multiplier = 1.0
+    for i in range(modifiers.shape[0]):
+        if (context_mask >> i) & 1:
+            multiplier *= modifiers[i]
+    return base_delay * multiplier
+
+
+def _cycle_repeat_window_py(card_ids, max_window):
+    """
+    Menor tamanho de janela (1 a max_window) em que as últimas cartas de
+    card_ids repetem as imediatamente anteriores, ou -1 se nenhuma repete.
+    """
+    count = card_ids.shape[0]
+    for size in range(1, max_window + 1):
+        if 2 * size > count:
+            break
+        repeated = True
+        for i in range(count - size, count):
+            if card_ids[i] != card_ids[i - size]:
+                repeated = False
+                break
+        if repeated:
+            return size
+    return -1
+
+
+def _cycle_repeat_window_numpy(card_ids, max_window):
+    """Mesmo cálculo de _cycle_repeat_window_py, por fatias do NumPy"""
+    count = card_ids.shape[0]
+    for size in range(1, max_window + 1):
+        if 2 * size > count:
+            break
+        if np.array_equal(
+            card_ids[count - size :], card_ids[count - 2 * size : count - size]
+        ):
+            return size
+    return -1
+
+
+def _card_set_distance_py(card_ids, mid_point, id_count):
+    """
+    1 - Jaccard entre as cartas de card_ids[:mid_point] e
+    card_ids[mid_point:], com presença marcada em arrays de id_count
+    posições em vez de conjuntos.
+    """
+    first = np.zeros(id_count, dtype=np.bool_)
+    second = np.zeros(id_count, dtype=np.bool_)
+    for i in range(mid_point):
+        first[card_ids[i]] = True
+    for i in range(mid_point, card_ids.shape[0]):
+        second[card_ids[i]] = True
+
+    overlap = 0
+    total_unique = 0
+    for card_id in range(id_count):
+        if first[card_id] and second[card_id]:
+            overlap += 1
+        if first[card_id] or second[card_id]:
+            total_unique += 1
+
+    if total_unique > 0:
+        return 1.0 - overlap / total_unique
+    return 0.0
+
+
+def _card_set_distance_numpy(card_ids, mid_point, id_count):
+    """Mesmo cálculo de _card_set_distance_py com np.unique/np.intersect1d"""
+    first_cards = np.unique(card_ids[:mid_point])
+    second_cards = np.unique(card_ids[mid_point:])
+
+    overlap = np.intersect1d(
+        first_cards, second_cards, assume_unique=True
+    ).size
+    total_unique = first_cards.size + second_cards.size - overlap
+
+    if total_unique > 0:
+        return 1.0 - overlap / total_unique
+    return 0.0
+
+
+# Com numba os laços são compilados; sem ele, as versões do NumPy
+if NUMBA_AVAILABLE:
+    cycle_repeat_window = njit(cache=True)(_cycle_repeat_window_py)
+    card_set_distance = njit(cache=True)(_card_set_distance_py)
+else:
+    cycle_repeat_window = _cycle_repeat_window_numpy
+    card_set_distance = _card_set_distance_numpy
+
+
+_WARMED_UP = False
+
+
+def warm_up_kernels():
+    """
+    Compila (ou carrega do cache) os kernels usados nas decisões de
+    timing e elixir, para que a primeira jogada não pague o JIT.
+    Os argumentos têm os mesmos tipos das chamadas reais.
+    """
+    global _WARMED_UP
+    if _WARMED_UP or not NUMBA_AVAILABLE:
+        return
+    combo_timing_kernel(np.ones(1, dtype=np.float64), np.float64(1.0), 0)
+    elixir_horizon_predictions(
+        0.0, 0.0, 1.0, np.zeros(1, dtype=np.float64), 0.0, 0.0
+    )
+    card_ids = np.zeros(2, dtype=np.int16)
+    cycle_repeat_window(card_ids, 1)
+    card_set_distance(card_ids, 1, 1)
+    _WARMED_UP = True
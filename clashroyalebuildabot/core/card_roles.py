@@ -4,6 +4,7 @@ Define os diferentes papéis que cada carta pode desempenhar no jogo.
 """
 
 from enum import Enum
+from functools import cached_property
 from typing import Dict, List, Set
 from clashroyalebuildabot import Cards
 
@@ -123,9 +124,15 @@ class DeckAnalyzer:
     """Analisa a composição do deck e identifica estratégias"""
     
     def __init__(self, deck: List[Cards]):
+        self.set_deck(deck)
+    
+    def set_deck(self, deck: List[Cards]):
+        """Define o deck e recalcula tudo que deriva dele"""
         self.deck = deck
         self.roles_count = self._count_roles()
         self.strategy = self._identify_strategy()
+        # Invalidar valores derivados em cache
+        self.__dict__.pop("support_cards", None)
     
     def _count_roles(self) -> Dict[CardRole, int]:
         """Conta quantas cartas de cada papel existem no deck"""
@@ -172,11 +179,16 @@ class DeckAnalyzer:
                 
         return win_conditions[0]
     
-    def get_support_cards(self) -> List[Cards]:
-        """Retorna cartas de suporte do deck"""
+    @cached_property
+    def support_cards(self) -> List[Cards]:
+        """Cartas de suporte do deck, calculadas uma vez por deck"""
         return [card for card in self.deck 
                 if CardRoleDatabase.has_role(card, CardRole.SUPPORT)]
     
+    def get_support_cards(self) -> List[Cards]:
+        """Retorna cartas de suporte do deck"""
+        return self.support_cards
+    
     def should_play_aggressive(self, elixir: int, enemy_elixir_spent: int) -> bool:
         """Determina se deve jogar agressivamente baseado na estratégia do deck"""
         if self.strategy == "CYCLE":
@@ -8,7 +8,7 @@ from enum import Enum
 from dataclasses import dataclass
 from clashroyalebuildabot import Cards
 from .card_roles import CardRole, CardRoleDatabase
-from .game_state import GameStateInfo, ThreatLevel
+from .game_state import CALM_MODES, GameStateInfo, ThreatLevel
 
 
 class ComboType(Enum):
@@ -194,8 +194,8 @@ class ComboManager:
         """Avalia oportunidades de combo baseado no estado atual"""
         
         # Não iniciar combo se estamos defendendo ameaça crítica
-        if game_state.should_defend and game_state.get_primary_threat():
-            primary_threat = game_state.get_primary_threat()
+        if game_state.should_defend and game_state.primary_threat:
+            primary_threat = game_state.primary_threat
             if primary_threat.threat_level.value >= 3:
                 return None
         
@@ -240,7 +240,7 @@ class ComboManager:
             if game_state.enemy_elixir_deficit >= 4:
                 score += 0.3
         elif combo.combo_type == ComboType.TANK_SUPPORT:
-            if game_state.game_mode in ["NEUTRAL", "ATTACK"]:
+            if game_state.game_mode & CALM_MODES:
                 score += 0.2
         elif combo.combo_type == ComboType.QUICK_CYCLE:
             if game_state.enemy_elixir_deficit >= 2:
@@ -361,4 +361,23 @@ class ComboManager:
                 return 1.5  # Boost moderado para cartas de suporte
         
         return 1.0  # Sem boost
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Boosts de prioridade de todas as cartas em combos ativos, por nome.
+        Equivale a chamar get_combo_priority_boost para cada carta
+        (cartas ausentes têm boost 1.0).
+        """
+        boosts = {}
+        for combo in self.active_combos:
+            if combo.is_complete:
+                continue
+            
+            # O primeiro combo que menciona a carta decide o boost
+            if combo.expected_next_card:
+                boosts.setdefault(combo.expected_next_card.name, 2.0)
+            for card in combo.definition.support_cards:
+                boosts.setdefault(card.name, 1.5)
+        
+        return boosts
 
@@ -0,0 +1,95 @@
+"""
+Identificadores inteiros de cartas/unidades e conjuntos de contadores.
+
+Os nomes são convertidos em IDs uma única vez (na análise das ameaças),
+permitindo que as ações testem contadores com pertinência em frozenset
+em vez de varrer listas de substrings a cada chamada.
+"""
+
+from dataclasses import fields
+from typing import Dict, FrozenSet, Iterable
+
+import numpy as np
+
+from clashroyalebuildabot.namespaces.cards import Cards
+from clashroyalebuildabot.namespaces.units import Units
+
+UNKNOWN_CARD_ID = -1
+
+
+def _build_card_ids() -> Dict[str, int]:
+    """Vocabulário de nomes: cartas primeiro, depois unidades restantes"""
+    names = [getattr(Cards, f.name).name for f in fields(Cards)]
+    names += [getattr(Units, f.name).name for f in fields(Units)]
+
+    card_ids = {}
+    for name in names:
+        card_ids.setdefault(name.lower(), len(card_ids))
+    return card_ids
+
+
+CARD_IDS: Dict[str, int] = _build_card_ids()
+
+
+def card_id_for(name: str) -> int:
+    """Retorna o ID inteiro de um nome de carta/unidade"""
+    return CARD_IDS.get(name.lower(), UNKNOWN_CARD_ID)
+
+
+def ids_matching(substrings: Iterable[str]) -> FrozenSet[int]:
+    """
+    IDs de todos os nomes que contêm alguma das substrings.
+    Mantém a mesma regra de correspondência das antigas listas de nomes.
+    """
+    substrings = tuple(substrings)
+    return frozenset(
+        card_id
+        for name, card_id in CARD_IDS.items()
+        if any(sub in name for sub in substrings)
+    )
+
+
+# Contadores do Corredor
+HOG_HARD_COUNTERS = ids_matching(
+    ["cannon", "tesla", "tombstone", "skeleton_army", "barbarians"]
+)
+HOG_SOFT_COUNTERS = ids_matching(
+    ["knight", "valkyrie", "mini_pekka", "guards"]
+)
+HOG_WAIT_COUNTERS = ids_matching(
+    ["cannon", "tesla", "tombstone", "skeleton_army"]
+)
+DEFENSIVE_BUILDINGS = ids_matching(["cannon", "tesla", "tombstone"])
+
+# Defesas pesadas contra o Gigante
+HEAVY_DEFENSE_IDS = ids_matching(["inferno_tower", "pekka", "mini_pekka"])
+
+# Ameaças relevantes para a Mosqueteira
+MEDIUM_HP_THREATS = ids_matching(
+    ["wizard", "musketeer", "electro_wizard", "witch"]
+)
+# Ameaças aéreas que pedem defesa aérea dedicada (score)
+AIR_DEFENSE_THREATS = ids_matching(
+    ["balloon", "lava_hound", "baby_dragon", "minion", "minion_horde"]
+)
+# Qualquer unidade aérea (posicionamento e prioridade)
+AIR_THREATS = ids_matching(["balloon", "minion", "dragon", "lava"])
+
+
+def lookup_table(card_ids: FrozenSet[int]) -> np.ndarray:
+    """
+    Tabela booleana indexada por ID: tabela[batch.card_ids] dá a máscara.
+    A posição extra no fim fica False e atende UNKNOWN_CARD_ID (-1).
+    """
+    table = np.zeros(len(CARD_IDS) + 1, dtype=np.bool_)
+    table[sorted(card_ids)] = True
+    return table
+
+
+# Tabelas de pertinência por ID (uma indexação em vez de np.isin)
+DEFENSIVE_BUILDINGS_LUT = lookup_table(DEFENSIVE_BUILDINGS)
+HOG_HARD_COUNTERS_LUT = lookup_table(HOG_HARD_COUNTERS)
+HOG_SOFT_COUNTERS_LUT = lookup_table(HOG_SOFT_COUNTERS)
+HOG_WAIT_COUNTERS_LUT = lookup_table(HOG_WAIT_COUNTERS)
+AIR_DEFENSE_THREATS_LUT = lookup_table(AIR_DEFENSE_THREATS)
+AIR_THREATS_LUT = lookup_table(AIR_THREATS)
@@ -3,6 +3,7 @@ Sistema de defesa aprimorado com priorização inteligente de ameaças
 e coordenação de múltiplas cartas defensivas.
 """
 
+import re
 from typing import List, Dict, Optional, Tuple, Set
 from enum import Enum
 from dataclasses import dataclass
@@ -10,6 +11,19 @@ from clashroyalebuildabot import Cards
 from .card_roles import CardRole, CardRoleDatabase
 from .game_state import GameStateInfo, ThreatInfo, ThreatLevel
 
+# Unidades de enxame, compiladas uma vez (busca por substring no nome)
+_SWARM_RE = re.compile("skeleton|goblin|minion|bat")
+
+
+# Custos de elixir estimados por nome de carta (mapeamento simplificado)
+_CARD_ELIXIR_COSTS: Dict[str, int] = {
+    'skeleton_army': 3, 'goblins': 2, 'archers': 3, 'knight': 3,
+    'musketeer': 4, 'wizard': 5, 'mini_pekka': 4, 'valkyrie': 4,
+    'cannon': 3, 'tesla': 4, 'inferno_tower': 5, 'bomb_tower': 4,
+    'arrows': 3, 'fireball': 4, 'zap': 2, 'the_log': 2,
+    'giant': 5, 'golem': 8, 'pekka': 7, 'hog_rider': 4,
+}
+
 
 class DefenseType(Enum):
     """Tipos de defesa disponíveis"""
@@ -221,17 +235,10 @@ class DefenseManager:
         
         return affordable_cards[:3]  # Máximo 3 cartas
     
-    def _get_card_elixir_cost(self, card: Cards) -> int:
+    @staticmethod
+    def _get_card_elixir_cost(card: Cards) -> int:
         """Retorna custo de elixir estimado da carta"""
-        # Mapeamento simplificado de custos
-        costs = {
-            'skeleton_army': 3, 'goblins': 2, 'archers': 3, 'knight': 3,
-            'musketeer': 4, 'wizard': 5, 'mini_pekka': 4, 'valkyrie': 4,
-            'cannon': 3, 'tesla': 4, 'inferno_tower': 5, 'bomb_tower': 4,
-            'arrows': 3, 'fireball': 4, 'zap': 2, 'the_log': 2,
-            'giant': 5, 'golem': 8, 'pekka': 7, 'hog_rider': 4,
-        }
-        return costs.get(card.name.lower(), 4)  # Default 4
+        return _CARD_ELIXIR_COSTS.get(card.name, 4)  # Default 4
     
     def _create_defense_response(self, primary_threat: ThreatInfo, 
                                threat_analysis: Dict, 
@@ -350,9 +357,8 @@ class DefenseManager:
             return True
         
         # Usar feitiço contra swarm
-        swarm_indicators = ['skeleton', 'goblin', 'minion', 'bat']
         for threat in threats:
-            if any(indicator in threat.card_name.lower() for indicator in swarm_indicators):
+            if _SWARM_RE.search(threat.card_name_lower):
                 return True
         
         return False
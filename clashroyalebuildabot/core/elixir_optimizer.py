@@ -6,10 +6,24 @@ Analisa quando gastar elixir e quando economizar.
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from enum import Enum
+import re
 import time
 from clashroyalebuildabot import Cards
 
 
+# Categorias de cartas, compiladas uma vez (busca por substring no nome)
+_CRITICAL_DEFENSE_RE = re.compile(
+    "inferno_tower|cannon|tesla|bomb_tower|mini_pekka|pekka|valkyrie|knight"
+)
+_HIGH_VALUE_ATTACK_RE = re.compile(
+    "giant|golem|pekka|mega_knight|hog_rider|ram_rider|balloon"
+)
+_EFFICIENT_DEFENSE_RE = re.compile(
+    "archers|musketeer|wizard|electro_wizard|skeletons|goblins|spear_goblins"
+)
+_MODERATE_ATTACK_RE = re.compile("knight|valkyrie|mini_pekka|baby_dragon")
+
+
 class ElixirState(Enum):
     """Estados do elixir"""
     CRITICAL = "critical"      # 0-2 elixir
@@ -249,41 +263,22 @@ class ElixirOptimizer:
     def _is_critical_defense(self, card: Cards) -> bool:
         """Verifica se é uma defesa crítica"""
         
-        critical_defenses = [
-            'inferno_tower', 'cannon', 'tesla', 'bomb_tower',
-            'mini_pekka', 'pekka', 'valkyrie', 'knight'
-        ]
-        
-        return any(defense in card.name.lower() for defense in critical_defenses)
+        return _CRITICAL_DEFENSE_RE.search(card.name.lower()) is not None
     
     def _is_high_value_attack(self, card: Cards) -> bool:
         """Verifica se é um ataque de alto valor"""
         
-        high_value_attacks = [
-            'giant', 'golem', 'pekka', 'mega_knight',
-            'hog_rider', 'ram_rider', 'balloon'
-        ]
-        
-        return any(attack in card.name.lower() for attack in high_value_attacks)
+        return _HIGH_VALUE_ATTACK_RE.search(card.name.lower()) is not None
     
     def _is_efficient_defense(self, card: Cards) -> bool:
         """Verifica se é uma defesa eficiente"""
         
-        efficient_defenses = [
-            'archers', 'musketeer', 'wizard', 'electro_wizard',
-            'skeletons', 'goblins', 'spear_goblins'
-        ]
-        
-        return any(defense in card.name.lower() for defense in efficient_defenses)
+        return _EFFICIENT_DEFENSE_RE.search(card.name.lower()) is not None
     
     def _is_moderate_attack(self, card: Cards) -> bool:
         """Verifica se é um ataque moderado"""
         
-        moderate_attacks = [
-            'knight', 'valkyrie', 'mini_pekka', 'baby_dragon'
-        ]
-        
-        return any(attack in card.name.lower() for attack in moderate_attacks)
+        return _MODERATE_ATTACK_RE.search(card.name.lower()) is not None
     
     def _calculate_expected_value(self, card: Cards, cost: int, advantage: int) -> float:
         """Calcula o valor esperado de uma carta"""
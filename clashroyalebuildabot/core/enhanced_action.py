@@ -4,27 +4,61 @@ Substitui a Action original com funcionalidades inteligentes.
 """
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import List, Optional, Tuple, Dict
 from clashroyalebuildabot.namespaces.cards import Card
 from .card_roles import CardRole, CardRoleDatabase, DeckAnalyzer
 from .game_state import GameStateAnalyzer, GameStateInfo
+from .game_state import GameMode, GamePhase, MID_LATE_PHASES
 from .combo_system import ComboManager
 
+# Listas de nomes usadas pelos modificadores (constantes do módulo)
+_HEAVY_WIN_CONDITIONS = frozenset({"GOLEM", "ELECTRO_GIANT", "GIANT"})
+_EXPENSIVE_CARDS = frozenset({"GOLEM", "ELECTRO_GIANT", "PEKKA", "MEGA_KNIGHT"})
+
+
+@dataclass(frozen=True)
+class StrategicContext:
+    """Sistemas compartilhados por todas as ações aprimoradas do bot"""
+    deck_analyzer: DeckAnalyzer
+    game_state_analyzer: GameStateAnalyzer
+    combo_manager: ComboManager
+
 
 class EnhancedAction(ABC):
     """Classe base aprimorada para ações das cartas"""
     
     CARD: Card = None
     
+    # Atributos fixos: uma instância é criada por carta/posição a cada tick
+    __slots__ = (
+        "index", "tile_x", "tile_y",
+        "deck_analyzer", "game_state_analyzer", "combo_manager",
+        "_roles_cache", "_strategic_context",
+    )
+    
+    # Contexto do bot, herdado por toda ação criada (ver set_shared_context)
+    _shared_context: Optional[StrategicContext] = None
+    
+    # Termos constantes durante a partida (ver compile_specialized)
+    _specialized_strategy: Optional[str] = None
+    _specialized: Dict[str, float] = {}
+    
     def __init__(self, index: int, tile_x: int, tile_y: int):
         self.index = index
         self.tile_x = tile_x
         self.tile_y = tile_y
         
-        # Contexto estratégico
-        self.deck_analyzer: Optional[DeckAnalyzer] = None
-        self.game_state_analyzer: Optional[GameStateAnalyzer] = None
-        self.combo_manager: Optional[ComboManager] = None
+        # Contexto estratégico (compartilhado, se o bot já o definiu)
+        context = EnhancedAction._shared_context
+        if context is not None:
+            self.deck_analyzer = context.deck_analyzer
+            self.game_state_analyzer = context.game_state_analyzer
+            self.combo_manager = context.combo_manager
+        else:
+            self.deck_analyzer: Optional[DeckAnalyzer] = None
+            self.game_state_analyzer: Optional[GameStateAnalyzer] = None
+            self.combo_manager: Optional[ComboManager] = None
         
         # Cache de informações
         self._roles_cache: Optional[List[CardRole]] = None
@@ -38,6 +72,38 @@ class EnhancedAction(ABC):
         self.game_state_analyzer = game_state_analyzer
         self.combo_manager = combo_manager
     
+    @staticmethod
+    def set_shared_context(context: Optional[StrategicContext]):
+        """
+        Define o contexto usado por todas as ações aprimoradas criadas a
+        partir de agora. Chamado uma vez pelo bot ao iniciar os sistemas.
+        """
+        EnhancedAction._shared_context = context
+    
+    @classmethod
+    def compile_specialized(cls, deck_strategy: str):
+        """
+        Pré-calcula os termos de score que só dependem da estratégia do deck.
+        Chamado uma vez no início da partida; as instâncias criadas a cada
+        tick passam a ler os valores prontos em vez de reavaliar os ramos.
+        """
+        cls._specialized = cls._build_specialized(deck_strategy)
+        cls._specialized_strategy = deck_strategy
+    
+    @classmethod
+    def _build_specialized(cls, deck_strategy: Optional[str]) -> Dict[str, float]:
+        """Termos constantes para uma estratégia (estendido pelas subclasses)"""
+        return {
+            "strategy_modifier": cls._strategy_modifier_for(deck_strategy),
+        }
+    
+    def _strategy_terms(self) -> Dict[str, float]:
+        """Termos da estratégia atual, pré-calculados se possível"""
+        strategy = self.deck_analyzer.strategy if self.deck_analyzer else None
+        if strategy == self._specialized_strategy and self._specialized:
+            return self._specialized
+        return self._build_specialized(strategy)
+    
     def get_card_roles(self) -> List[CardRole]:
         """Retorna os papéis desta carta"""
         if self._roles_cache is None:
@@ -67,11 +133,17 @@ class EnhancedAction(ABC):
         enhanced_score = self._apply_strategic_modifiers(base_score, game_state, state)
         
         # Aplicar boost de combo se aplicável
-        combo_boost = self.combo_manager.get_combo_priority_boost(self.CARD) if self.combo_manager else 1.0
+        combo_boost = self._get_combo_boost(game_state) if self.combo_manager else 1.0
         enhanced_score = [score * combo_boost for score in enhanced_score]
         
         return enhanced_score
     
+    def _get_combo_boost(self, game_state: GameStateInfo) -> float:
+        """Boost de combo da carta, lido da tabela calculada uma vez por tick"""
+        if game_state.combo_boosts is None:
+            game_state.combo_boosts = self.combo_manager.snapshot()
+        return game_state.combo_boosts.get(self.CARD.name, 1.0)
+    
     def _apply_strategic_modifiers(self, base_score: List[float], 
                                  game_state: GameStateInfo, state) -> List[float]:
         """Aplica modificadores baseados na estratégia e contexto"""
@@ -106,7 +178,7 @@ class EnhancedAction(ABC):
         
         # Cartas defensivas têm prioridade quando há ameaças
         if self.has_role(CardRole.DEFENSE) and game_state.should_defend:
-            threat = game_state.get_primary_threat()
+            threat = game_state.primary_threat
             if threat and threat.requires_immediate_response:
                 return 1.8
             return 1.4
@@ -121,7 +193,7 @@ class EnhancedAction(ABC):
         # Cartas de suporte têm prioridade moderada quando há tanque no campo
         if self.has_role(CardRole.SUPPORT):
             # Verificar se há tanque aliado no campo (implementação simplificada)
-            return 1.3 if game_state.game_mode == "ATTACK" else 1.0
+            return 1.3 if game_state.game_mode is GameMode.ATTACK else 1.0
         
         # Feitiços têm prioridade quando inimigo tem swarm
         if self.has_role(CardRole.SPELL):
@@ -136,39 +208,44 @@ class EnhancedAction(ABC):
         
         # Cartas de cycle são melhores no início
         if self.has_role(CardRole.CYCLE):
-            if game_state.phase.value == "early":
+            if game_state.phase is GamePhase.EARLY:
                 return 1.2
-            elif game_state.phase.value == "late":
+            elif game_state.phase is GamePhase.LATE:
                 return 0.9
         
         # Tanques pesados são melhores no meio/final
         if self.has_role(CardRole.TANK) and not self.has_role(CardRole.CYCLE):
-            if game_state.phase.value in ["mid", "late"]:
+            if game_state.phase & MID_LATE_PHASES:
                 return 1.3
-            elif game_state.phase.value == "early":
+            elif game_state.phase is GamePhase.EARLY:
                 return 0.8
         
         return 1.0
     
     def _get_strategy_modifier(self, game_state: GameStateInfo, state) -> float:
         """Modificador baseado na estratégia do deck"""
+        return self._strategy_terms()["strategy_modifier"]
+    
+    @classmethod
+    def _strategy_modifier_for(cls, strategy: Optional[str]) -> float:
+        """Modificador de estratégia para esta carta (constante na partida)"""
         
-        if not self.deck_analyzer:
+        if strategy is None:
             return 1.0
         
-        strategy = self.deck_analyzer.strategy
+        roles = CardRoleDatabase.get_roles(cls.CARD)
         
         # Deck de cycle favorece cartas de baixo custo
-        if strategy == "CYCLE" and self.has_role(CardRole.CYCLE):
+        if strategy == "CYCLE" and CardRole.CYCLE in roles:
             return 1.4
         
         # Deck defensivo favorece cartas de defesa
-        if strategy == "DEFENSIVE" and self.has_role(CardRole.DEFENSE):
+        if strategy == "DEFENSIVE" and CardRole.DEFENSE in roles:
             return 1.3
         
         # Deck de tanque pesado favorece win conditions grandes
-        if strategy == "HEAVY_TANK" and self.has_role(CardRole.WIN_CONDITION):
-            if self.CARD.name in ["GOLEM", "ELECTRO_GIANT", "GIANT"]:
+        if strategy == "HEAVY_TANK" and CardRole.WIN_CONDITION in roles:
+            if cls.CARD.name in _HEAVY_WIN_CONDITIONS:
                 return 1.5
         
         return 1.0
@@ -181,8 +258,7 @@ class EnhancedAction(ABC):
             return 1.2
         
         # Reduzir prioridade de cartas caras quando elixir baixo
-        expensive_cards = ["GOLEM", "ELECTRO_GIANT", "PEKKA", "MEGA_KNIGHT"]
-        if self.CARD.name in expensive_cards and state.numbers.elixir.number <= 5:
+        if self.CARD.name in _EXPENSIVE_CARDS and state.numbers.elixir.number <= 5:
             return 0.6
         
         # Aumentar prioridade de contra-ataque após defesa bem-sucedida
@@ -216,7 +292,7 @@ class EnhancedAction(ABC):
         
         # Defesas: posições defensivas baseadas na ameaça
         if self.has_role(CardRole.DEFENSE):
-            threat = game_state.get_primary_threat()
+            threat = game_state.primary_threat
             if threat:
                 # Posicionar próximo à ameaça
                 threat_x, threat_y = threat.position
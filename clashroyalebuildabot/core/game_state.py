@@ -3,18 +3,44 @@ Sistema de análise do estado do jogo para tomada de decisões estratégicas.
 Interpreta o estado bruto do jogo e fornece informações de alto nível.
 """
 
-from typing import List, Dict, Optional, Tuple
-from enum import Enum
-from dataclasses import dataclass
+from typing import List, Dict, NamedTuple, Optional, Tuple
+from enum import Enum, IntFlag
+from dataclasses import dataclass, field
+
+import numpy as np
+
 from .card_roles import DeckAnalyzer, CardRole, CardRoleDatabase
+from .counters import AIR_DEFENSE_THREATS_LUT
+from .counters import AIR_THREATS, AIR_THREATS_LUT
+from .counters import DEFENSIVE_BUILDINGS_LUT
+from .counters import HEAVY_DEFENSE_IDS, UNKNOWN_CARD_ID, card_id_for
+
+
+class GamePhase(IntFlag):
+    """Fases do jogo (flags: várias fases são testadas com um único &)"""
+    EARLY = 1      # 0-1 minuto
+    MID = 2        # 1-2 minutos  
+    LATE = 4       # 2+ minutos
+    OVERTIME = 8   # Tempo extra
+    
+    @property
+    def label(self) -> str:
+        """Nome legível da fase ("early", "mid", ...)"""
+        return self.name.lower()
 
 
-class GamePhase(Enum):
-    """Fases do jogo"""
-    EARLY = "early"      # 0-1 minuto
-    MID = "mid"          # 1-2 minutos  
-    LATE = "late"        # 2+ minutos
-    OVERTIME = "overtime" # Tempo extra
+class GameMode(IntFlag):
+    """Modos de jogo (flags: vários modos são testados com um único &)"""
+    NEUTRAL = 1
+    ATTACK = 2
+    FORCED_ATTACK = 4
+    ACTIVE_DEFENSE = 8
+    EMERGENCY_DEFENSE = 16
+    
+    @property
+    def label(self) -> str:
+        """Nome do modo ("ATTACK", "NEUTRAL", ...)"""
+        return self.name
 
 
 class ThreatLevel(Enum):
@@ -26,6 +52,12 @@ class ThreatLevel(Enum):
     CRITICAL = 4
 
 
+# Máscaras constantes para comparações no caminho quente
+MID_LATE_PHASES = GamePhase.MID | GamePhase.LATE
+CALM_MODES = GameMode.NEUTRAL | GameMode.ATTACK
+DEFENSE_MODES = GameMode.EMERGENCY_DEFENSE | GameMode.ACTIVE_DEFENSE
+
+
 @dataclass
 class ThreatInfo:
     """Informações sobre uma ameaça"""
@@ -35,6 +67,74 @@ class ThreatInfo:
     distance_to_tower: float
     is_targeting_tower: bool
     requires_immediate_response: bool
+    card_id: int = UNKNOWN_CARD_ID  # ID inteiro (ver core.counters)
+    card_name_lower: str = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Calculado uma vez, evitando .lower() a cada score
+        self.card_name_lower = self.card_name.lower()
+
+
+@dataclass(frozen=True)
+class ThreatBatch:
+    """Ameaças em arrays paralelos (SoA), na mesma ordem da lista de ThreatInfo"""
+    positions: np.ndarray  # (N, 2) int16: tile_x, tile_y
+    card_ids: np.ndarray   # (N,) int16
+    distances: np.ndarray  # (N,) float32: distância até a torre
+    immediate: np.ndarray  # (N,) bool: requer resposta imediata
+    levels: np.ndarray     # (N,) int8: valor do ThreatLevel
+    air: np.ndarray        # (N,) bool: unidade aérea
+    air_defense: np.ndarray  # (N,) bool: pede defesa aérea dedicada
+    air_mask: int          # bit i ligado se a ameaça i é aérea
+    critical_mask: int     # bit i ligado se a ameaça i é HIGH ou CRITICAL
+    
+    @classmethod
+    def from_threats(cls, threats: List[ThreatInfo]) -> 'ThreatBatch':
+        count = len(threats)
+        positions = np.empty((count, 2), dtype=np.int16)
+        card_ids = np.empty(count, dtype=np.int16)
+        distances = np.empty(count, dtype=np.float32)
+        immediate = np.empty(count, dtype=np.bool_)
+        levels = np.empty(count, dtype=np.int8)
+        air_mask = 0
+        critical_mask = 0
+        for i, threat in enumerate(threats):
+            positions[i] = threat.position
+            card_ids[i] = threat.card_id
+            distances[i] = threat.distance_to_tower
+            immediate[i] = threat.requires_immediate_response
+            level = threat.threat_level.value
+            levels[i] = level
+            if threat.card_id in AIR_THREATS:
+                air_mask |= 1 << i
+            if level >= 3:
+                critical_mask |= 1 << i
+        return cls(
+            positions, card_ids, distances, immediate, levels,
+            AIR_THREATS_LUT[card_ids], AIR_DEFENSE_THREATS_LUT[card_ids],
+            air_mask, critical_mask,
+        )
+    
+    @property
+    def x(self) -> np.ndarray:
+        return self.positions[:, 0]
+    
+    @property
+    def y(self) -> np.ndarray:
+        return self.positions[:, 1]
+    
+    def __len__(self) -> int:
+        return len(self.card_ids)
+
+
+class GameFeatures(NamedTuple):
+    """Valores escalares do GameStateInfo usados pelos scores, extraídos uma vez"""
+    should_defend: bool
+    should_attack: bool
+    threat_count: int
+    enemy_elixir_deficit: int
+    early_phase: bool
+    mid_late_phase: bool
 
 
 @dataclass
@@ -55,8 +155,31 @@ class GameStateAnalyzer:
         self.last_enemy_elixir_spent = 0
         self.enemy_cycle_tracking = []
         
+        # Cache do último estado analisado (um estado por tick)
+        self._last_state = None
+        self._last_result = None
+        
     def analyze_state(self, state) -> 'GameStateInfo':
-        """Analisa o estado atual e retorna informações estratégicas"""
+        """
+        Analisa o estado atual e retorna informações estratégicas.
+        O resultado é reaproveitado enquanto o mesmo estado for consultado,
+        então todas as ações de um tick compartilham a mesma análise.
+        """
+        if state is self._last_state:
+            return self._last_result
+        
+        result = self._analyze_state(state)
+        self._last_state = state
+        self._last_result = result
+        return result
+    
+    def new_frame(self):
+        """Descarta a análise em cache - chamado no início de cada tick"""
+        self._last_state = None
+        self._last_result = None
+    
+    def _analyze_state(self, state) -> 'GameStateInfo':
+        """Executa a análise completa do estado"""
         
         # Determinar fase do jogo (assumindo que temos acesso ao tempo)
         game_phase = self._determine_game_phase(state)
@@ -121,7 +244,8 @@ class GameStateAnalyzer:
                     threat_level=threat_level,
                     distance_to_tower=self._calculate_distance_to_tower(enemy.position),
                     is_targeting_tower=self._is_targeting_tower(enemy),
-                    requires_immediate_response=threat_level.value >= 3
+                    requires_immediate_response=threat_level.value >= 3,
+                    card_id=card_id_for(card_name)
                 ))
         
         # Ordenar por nível de ameaça
@@ -214,21 +338,21 @@ class GameStateAnalyzer:
             return 0
     
     def _determine_game_mode(self, state, threats: List[ThreatInfo], 
-                           opportunities: List[OpportunityInfo]) -> str:
+                           opportunities: List[OpportunityInfo]) -> GameMode:
         """Determina o modo de jogo atual"""
         critical_threats = [t for t in threats if t.threat_level == ThreatLevel.CRITICAL]
         high_threats = [t for t in threats if t.threat_level == ThreatLevel.HIGH]
         
         if critical_threats:
-            return "EMERGENCY_DEFENSE"
+            return GameMode.EMERGENCY_DEFENSE
         elif high_threats:
-            return "ACTIVE_DEFENSE"
+            return GameMode.ACTIVE_DEFENSE
         elif opportunities and state.numbers.elixir.number >= 6:
-            return "ATTACK"
+            return GameMode.ATTACK
         elif state.numbers.elixir.number >= 9:
-            return "FORCED_ATTACK"
+            return GameMode.FORCED_ATTACK
         else:
-            return "NEUTRAL"
+            return GameMode.NEUTRAL
     
     def _get_recommended_strategy(self, threats: List[ThreatInfo], 
                                 opportunities: List[OpportunityInfo], state) -> str:
@@ -252,16 +376,74 @@ class GameStateInfo:
     phase: GamePhase
     threats: List[ThreatInfo]
     opportunities: List[OpportunityInfo]
-    game_mode: str
+    game_mode: GameMode
     our_elixir: int
     enemy_elixir_deficit: int
     should_defend: bool
     should_attack: bool
     recommended_strategy: str
     
+    # Mesmas ameaças em arrays (SoA) para predicados vetorizados
+    threat_batch: ThreatBatch = field(init=False, repr=False)
+    
+    # Bit i ligado se a ameaça i é uma defesa pesada
+    enemy_heavy_defense_mask: int = field(init=False, repr=False)
+    
+    # Ameaça mais crítica (a primeira da lista já ordenada)
+    primary_threat: Optional[ThreatInfo] = field(init=False, repr=False)
+    
+    # Escalares do estado numa única tupla, para desempacotar de uma vez
+    features: GameFeatures = field(init=False, repr=False)
+    
+    # Bit i ligado se a ameaça i é aérea / de nível HIGH ou CRITICAL
+    air_threat_mask: int = field(init=False, repr=False)
+    critical_threat_mask: int = field(init=False, repr=False)
+    
+    # Contagens por lane, calculadas uma vez e lidas por todas as ações
+    left_threat_count: int = field(init=False, repr=False)
+    right_threat_count: int = field(init=False, repr=False)
+    left_defense_count: int = field(init=False, repr=False)
+    right_defense_count: int = field(init=False, repr=False)
+    
+    # Boosts de combo do tick (nome da carta -> boost), preenchido sob demanda
+    combo_boosts: Optional[Dict[str, float]] = field(
+        default=None, init=False, repr=False
+    )
+    
+    def __post_init__(self):
+        batch = ThreatBatch.from_threats(self.threats)
+        self.threat_batch = batch
+        self.primary_threat = self.threats[0] if self.threats else None
+        
+        left_mask = batch.x <= 9
+        defense_mask = DEFENSIVE_BUILDINGS_LUT[batch.card_ids]
+        self.left_threat_count = int(np.count_nonzero(left_mask))
+        self.right_threat_count = len(batch) - self.left_threat_count
+        self.left_defense_count = int(np.count_nonzero(defense_mask & left_mask))
+        self.right_defense_count = (
+            int(np.count_nonzero(defense_mask)) - self.left_defense_count
+        )
+        
+        self.enemy_heavy_defense_mask = 0
+        for i, threat in enumerate(self.threats):
+            if threat.card_id in HEAVY_DEFENSE_IDS:
+                self.enemy_heavy_defense_mask |= 1 << i
+        
+        self.features = GameFeatures(
+            should_defend=self.should_defend,
+            should_attack=self.should_attack,
+            threat_count=len(self.threats),
+            enemy_elixir_deficit=self.enemy_elixir_deficit,
+            early_phase=self.phase is GamePhase.EARLY,
+            mid_late_phase=bool(self.phase & MID_LATE_PHASES),
+        )
+        
+        self.air_threat_mask = batch.air_mask
+        self.critical_threat_mask = batch.critical_mask
+    
     def get_primary_threat(self) -> Optional[ThreatInfo]:
         """Retorna a ameaça mais crítica"""
-        return self.threats[0] if self.threats else None
+        return self.primary_threat
     
     def get_best_opportunity(self) -> Optional[OpportunityInfo]:
         """Retorna a melhor oportunidade de ataque"""
@@ -1,18 +1,35 @@
 import os
 import yaml
+from collections.abc import Mapping
 from typing import Dict, List, Any
 
+from clashroyalebuildabot import actions
 from clashroyalebuildabot.constants import SRC_DIR
-from clashroyalebuildabot.actions import *
 
-# Mapeamento de nomes de ação para classes
-ACTION_MAPPING = {}
 
-# Criar mapeamento dinamicamente para todas as Actions
-from clashroyalebuildabot.actions import __all__ as action_names
-for action_name in action_names:
-    action_class = globals()[action_name]
-    ACTION_MAPPING[action_name] = action_class
+class _ActionMapping(Mapping):
+    """
+    Mapeamento nome da ação -> classe, resolvido sob demanda.
+    Só os módulos das ações realmente acessadas são importados.
+    """
+
+    def __getitem__(self, action_name):
+        if action_name not in actions.__all__:
+            raise KeyError(action_name)
+        return getattr(actions, action_name)
+
+    def __iter__(self):
+        return iter(actions.__all__)
+
+    def __len__(self):
+        return len(actions.__all__)
+
+    def __contains__(self, action_name):
+        return action_name in actions.__all__
+
+
+# Mapeamento de nomes de ação para classes
+ACTION_MAPPING = _ActionMapping()
 
 
 class DeckManager:
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
-from typing import List, Tuple
+from dataclasses import field
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 from clashroyalebuildabot.namespaces.cards import Card
 from clashroyalebuildabot.namespaces.numbers import Numbers
@@ -7,6 +10,33 @@ from clashroyalebuildabot.namespaces.screens import Screen
 from clashroyalebuildabot.namespaces.units import UnitDetection
 
 
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Posições dos inimigos em arrays (SoA), calculadas uma vez por tick"""
+
+    enemy_tile_x: np.ndarray
+    enemy_tile_y: np.ndarray
+
+    @classmethod
+    def from_state(cls, state):
+        enemies = state.enemies
+        x = np.fromiter(
+            (e.position.tile_x for e in enemies),
+            dtype=np.int64,
+            count=len(enemies),
+        )
+        y = np.fromiter(
+            (e.position.tile_y for e in enemies),
+            dtype=np.int64,
+            count=len(enemies),
+        )
+        return cls(enemy_tile_x=x, enemy_tile_y=y)
+
+    @property
+    def enemy_count(self) -> int:
+        return len(self.enemy_tile_x)
+
+
 @dataclass
 class State:
     allies: List[UnitDetection]
@@ -15,3 +45,12 @@ class State:
     cards: Tuple[Card, Card, Card, Card]
     ready: List[int]
     screen: Screen
+    snapshot: Optional[StateSnapshot] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def get_snapshot(self) -> StateSnapshot:
+        """Retorna o snapshot do tick, criando-o se o bot não o fez"""
+        if self.snapshot is None:
+            self.snapshot = StateSnapshot.from_state(self)
+        return self.snapshot